@@ -1,9 +1,20 @@
 import streamlit as st
-import pandas as pd
-import json
+import os
+import html
+import threading
+import time
+import uuid
 import altair as alt
 from datetime import date, datetime, timedelta
 from streamlit_gsheets import GSheetsConnection
+import perf
+from seasons import archive_season, list_seasons, load_season
+from simulate import PRESETS, compare_standings, history_features, rules_from_table, rules_table, update_features
+from words import word_index
+from storage import SheetsStorage, SQLiteStorage, StaleWriteError, SyncStorage
+from league import (GUESS_KEYS, apply_change, edit_copy, build_burn_index, build_stats, build_trend, burn_status, complete_words, day_result,
+                    build_windows, parse_import, player_stats, recalculate_history, restore_replay_state, trend_series, update_burn_index, update_stats,
+                    update_trend, update_windows, window_totals)
 
 # --- ICONS ---
 ICON_TROPHY = "\U0001F3C6"
@@ -119,135 +130,248 @@ def mobile_friendly_style():
             color: #adb5bd; 
             box-shadow: none;
         }
+
+        /* --- HISTORY CARDS --- */
+        .day-card {
+            border-bottom: 1px solid #e9ecef;
+            padding: 4px 0 10px 0;
+        }
+        .day-result { font-size: 0.85rem; color: #6c757d; }
+        .day-scores {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 4px 24px;
+            margin-top: 4px;
+        }
+        .day-wrong { font-size: 0.8rem; color: #6c757d; }
         </style>
         """, unsafe_allow_html=True)
 
 mobile_friendly_style()
 
 # --- DATA MANAGER ---
+CACHE_TTL_SECONDS = 300  # how long a snapshot may hide writes made outside this app
+
 def get_connection():
     return st.connection("gsheets", type=GSheetsConnection)
 
+# Backend chosen by WORDLE_STORAGE: "gsheets" (default), "sqlite" (local file at WORDLE_DB)
+# or "sync" (SQLite as the hot store, replicated to Sheets in the background).
+@st.cache_resource
+def get_storage():
+    kind = os.environ.get("WORDLE_STORAGE", "gsheets"); db_path = os.environ.get("WORDLE_DB", "league.db")
+    if kind == "sqlite": return SQLiteStorage(db_path)
+    sheets = SheetsStorage(get_connection())
+    if kind == "sync": return SyncStorage(SQLiteStorage(db_path), sheets)
+    return sheets
+
+def _read_storage(previous=None):
+    data, layout, warnings = get_storage().load()
+    for w in warnings: st.toast(f"⚠️ Warning: {w}", icon="⚠️")
+    with perf.phase("restore_replay_state"): restore_replay_state(data, previous)
+    return data, layout
+
+# Process-wide snapshot shared by every session. "version" is bumped whenever the snapshot
+# is replaced. Edits are applied to the snapshot straight away and queued in "pending" until
+# the write-behind thread has persisted them; "layout" always describes what storage holds.
+# A snapshot is never modified once installed (an edit copies it and installs the result),
+# so sessions and the writer share it as is; treat the data load_data returns as read-only.
+@st.cache_resource
+def _data_cache():
+    return {"version": 0, "data": None, "layout": None, "loaded_at": 0.0, "lock": threading.Lock(),
+            "views": {}, "views_version": None, "pending": [], "write_error": None, "wake": threading.Event()}
+
+def _cache_expired(cache):
+    if cache["data"] is None: return True
+    if cache["pending"]: return False  # never reload over edits that aren't persisted yet
+    return time.time() - cache["loaded_at"] > CACHE_TTL_SECONDS
+
+def _install_snapshot(cache, data, layout):
+    cache["data"] = data; cache["layout"] = layout; cache["loaded_at"] = time.time(); cache["version"] += 1
+
+# Keeps derived views in step with a new snapshot: updated from `replayed_from` when they
+# described the previous version, dropped (rebuilt on next use) otherwise. Updates return new
+# view objects and the whole dict is swapped, so sessions still rendering the old version
+# keep consistent views. Called with the cache lock held.
+def _refresh_views(cache, data, replayed_from, views_current):
+    if views_current and replayed_from is not None:
+        cache["views"] = {name: DERIVED_VIEWS[name][1](view, data, replayed_from) for name, view in cache["views"].items()}
+        cache["views_version"] = cache["version"]
+    else: cache["views"] = {}; cache["views_version"] = None
+
+# Storage is read outside the lock, so sessions reloading at the same time share one read
+# (see SheetsClient.read). A read is installed only if no other snapshot was installed while
+# it ran; with no edits pending when it started, no write can have raced it either.
 def load_data():
-    conn = get_connection()
-    df_players = conn.read(worksheet="players")
-    players_dict = {}
-    for index, row in df_players.iterrows():
-        burned_list = str(row["Burned"]).split("|") if pd.notna(row["Burned"]) and row["Burned"] != "" else []
-        sols_list = str(row["Past_Solutions"]).split("|") if pd.notna(row["Past_Solutions"]) and row["Past_Solutions"] != "" else []
-        players_dict[row["Name"]] = {
-            "score": int(row["Score"]), "clean_days": int(row["Clean_Days"]),
-            "burned": burned_list, "past_solutions": sols_list
-        }
-
-    # --- SAFER HISTORY LOADING ---
-    df_history = conn.read(worksheet="history")
-    history_list = []
-    
-    # Convert to Datetime, handle errors
-    df_history["Date"] = pd.to_datetime(df_history["Date"], errors="coerce")
-    
-    # If bad dates exist, fill with dummy date instead of deleting
-    if df_history["Date"].isnull().any():
-        st.toast("⚠️ Warning: Some dates were unreadable. Moved to bottom.", icon="⚠️")
-        df_history["Date"] = df_history["Date"].fillna(pd.Timestamp("1900-01-01"))
-
-    df_history = df_history.sort_values(by="Date", ascending=False)
-    
-    for index, row in df_history.iterrows():
-        raw_json = row["Scores_JSON"]
-        scores_data = {}
-        if pd.notna(raw_json) and str(raw_json).strip() != "":
-            try:
-                scores_data = json.loads(raw_json)
-            except:
-                scores_data = {}
-
-        history_list.append({
-            "date": row["Date"].strftime("%Y-%m-%d"),
-            "solution": row["Solution"] if pd.notna(row["Solution"]) else "?",
-            "winner_log": row["Winner_Log"] if pd.notna(row["Winner_Log"]) else "",
-            "victory_awarded": bool(row["Victory_Awarded"]),
-            "scores": scores_data
-        })
-    return {"players": players_dict, "history": history_list}
-
-def save_data(data):
-    conn = get_connection()
-    player_rows = []
-    for name, stats in data["players"].items():
-        player_rows.append({
-            "Name": name, "Score": stats["score"], "Clean_Days": stats["clean_days"],
-            "Burned": "|".join(stats["burned"]), "Past_Solutions": "|".join(stats["past_solutions"])
-        })
-    df_p = pd.DataFrame(player_rows)
-    history_rows = []
-    for h in data["history"]:
-        history_rows.append({
-            "Date": h["date"], "Solution": h["solution"],
-            "Winner_Log": h.get("winner_log", ""), "Victory_Awarded": h.get("victory_awarded", False),
-            "Scores_JSON": json.dumps(h["scores"])
-        })
-    df_h = pd.DataFrame(history_rows)
-    try:
-        conn.update(worksheet="players", data=df_p)
-        conn.update(worksheet="history", data=df_h)
-    except Exception as e:
-        st.error(f"Error saving: {e}")
-    st.cache_data.clear()
-
-def guess_from_base(base_score):
-    map_score = {10:1, 8:2, 6:3, 4:4, 2:5, 1:6, 0:"Fail"}
-    return map_score.get(base_score, "-")
-
-# --- CALCULATION LOGIC ---
-def calculate_day_stats(guesses, wrong_words_str, solution, current_burned_set, current_solutions_set, current_streak):
-    base_map = {1: 10, 2: 8, 3: 6, 4: 4, 5: 2, 6: 1, "Fail": 0}
-    base = base_map.get(guesses, 0)
-    if guesses == "Fail": base = 0
-    penalties = 0; penalty_log = []; new_burns_for_day = []
-    wrong_words_list = [w.strip().upper() for w in wrong_words_str.split(",") if w.strip()]
-    for word in wrong_words_list:
-        if word in current_burned_set: penalties += 2; penalty_log.append(f"{word} (Burned)")
-        elif word in current_solutions_set: penalty_log.append(f"{word} (Grace Used)"); new_burns_for_day.append(word) 
-        else: new_burns_for_day.append(word) 
-    is_clean = (penalties == 0)
-    bonus = 0; new_streak_val = current_streak
-    if is_clean:
-        new_streak_val += 1
-        tier = ((new_streak_val - 1) // 7) + 1
-        bonus = tier * 3
-    return {
-        "score": base - penalties + bonus, "base": base, "guesses": guesses, "penalties": penalties,
-        "bonus": bonus, "log": penalty_log, "new_burns": new_burns_for_day, 
-        "new_streak": new_streak_val, "wrong_words_input": wrong_words_str
-    }
-
-def recalculate_history(data):
-    for p in data["players"]: data["players"][p] = {"score": 0, "clean_days": 0, "burned": [], "past_solutions": []}
-    chronological = sorted(data["history"], key=lambda x: datetime.strptime(x["date"], "%Y-%m-%d"))
-    for day in chronological:
-        sol = day["solution"]; daily_perf = {}
-        for p_name in data["players"]:
-            if p_name in day["scores"]:
-                raw_input = day["scores"][p_name].get("wrong_words_input", "")
-                raw_guess = day["scores"][p_name].get("guesses", guess_from_base(day["scores"][p_name].get("base", 0)))
-                p_state = data["players"][p_name]
-                stats = calculate_day_stats(raw_guess, raw_input, sol, set(p_state["burned"]), set(p_state["past_solutions"]), p_state["clean_days"])
-                p_state["score"] += stats["score"]
-                p_state["clean_days"] = stats["new_streak"]
-                p_state["burned"].extend(stats["new_burns"])
-                if sol and sol not in p_state["past_solutions"]: p_state["past_solutions"].append(sol)
-                day["scores"][p_name] = stats
-                daily_perf[p_name] = stats["base"] - stats["penalties"]
-        if daily_perf:
-            max_perf = max(daily_perf.values())
-            winners = [p for p, s in daily_perf.items() if s == max_perf]
-            day["winner_log"] = f"{winners[0]} (+1)" if len(winners) == 1 else "Tie (No Bonus)"
-            day["victory_awarded"] = True
-            if len(winners) == 1: data["players"][winners[0]]["score"] += 1
-    data["history"] = list(reversed(chronological))
-    return data
+    cache = _data_cache(); _start_writer(); fresh = version = previous = None
+    while True:
+        with cache["lock"]:
+            stale = _cache_expired(cache)
+            if fresh is None: perf.cache_event("snapshot", not stale)
+            if not stale or (fresh is not None and cache["version"] == version):
+                if stale: _install_snapshot(cache, *fresh)
+                st.session_state["data_version"] = cache["version"]
+                return cache["data"]
+            version = cache["version"]; previous = cache["data"]
+        fresh = _read_storage(previous)
+
+# Cheap probe (no storage round trip): has the snapshot moved on since this session loaded it?
+def data_changed():
+    cache = _data_cache()
+    return cache["version"] != st.session_state.get("data_version") or _cache_expired(cache)
+
+def invalidate_data():
+    cache = _data_cache()
+    with cache["lock"]:
+        if not cache["pending"]: cache["data"] = None; cache["layout"] = None
+
+# Applies an edit (see apply_change) to the latest snapshot, replays from the affected date and
+# queues it for the writer. Sessions never overwrite each other because every edit is applied
+# to whatever the snapshot holds now, not to the copy the session rendered from. A season
+# archive is written here too, from that same data, so no edit can slip in between.
+def submit_change(change):
+    cache = _data_cache(); _start_writer()
+    with cache["lock"], perf.phase("apply_change"):
+        if _cache_expired(cache): _install_snapshot(cache, *_read_storage(cache["data"]))
+        views_current = cache["views_version"] == cache["version"]
+        data = edit_copy(cache["data"])  # shares every day and player the edit leaves alone
+        if change["kind"] == "archive_season" and "dates" not in change:
+            change["path"], change["dates"] = archive_season(change["name"], data, change["until"])
+        replay_from = apply_change(data, change)
+        if replay_from is not None: recalculate_history(data, replay_from)
+        _install_snapshot(cache, data, cache["layout"])
+        _refresh_views(cache, data, data.pop("replayed_from", None), views_current)
+        cache["pending"].append(change)
+        st.session_state["data_version"] = cache["version"]
+    cache["wake"].set()
+
+def pending_writes():
+    cache = _data_cache()
+    return len(cache["pending"]), cache["write_error"]
+
+# Sheets replica backlog and last error in "sync" mode; None for the other backends.
+def replica_status():
+    storage = get_storage()
+    return storage.replica_status() if hasattr(storage, "replica_status") else None
+
+# --- WRITE-BEHIND ---
+WRITE_DELAY_SECONDS = 1.0   # how long the writer lets a burst of edits build up
+WRITE_RETRY_SECONDS = 15
+WRITE_ATTEMPTS = 3          # merges tried when storage moved on under us
+
+@st.cache_resource
+def _start_writer():
+    thread = threading.Thread(target=_write_behind, args=(_data_cache(), get_storage()), name="write-behind", daemon=True)
+    thread.start()
+    return thread
+
+def _write_behind(cache, storage):
+    while True:
+        cache["wake"].wait(); time.sleep(WRITE_DELAY_SECONDS); cache["wake"].clear()
+        try:
+            _persist_pending(cache, storage); cache["write_error"] = None
+        except Exception as e:
+            cache["write_error"] = str(e)
+            time.sleep(WRITE_RETRY_SECONDS); cache["wake"].set()
+
+# Writes the current snapshot (covering every pending edit so far) in one save. The save is
+# checked against the storage version stamp in the layout; if someone else wrote first, the
+# pending edits are re-applied on top of a fresh load and the merged state is written instead.
+def _persist_pending(cache, storage):
+    with cache["lock"]:
+        if not cache["pending"]: return
+        data = cache["data"]; layout = cache["layout"]; done = len(cache["pending"])
+    for attempt in range(WRITE_ATTEMPTS):
+        try:
+            layout = storage.save(data, layout); break
+        except StaleWriteError:
+            fresh, layout, _ = storage.load()
+            with cache["lock"]:
+                for change in cache["pending"]: apply_change(fresh, change)
+                recalculate_history(fresh); fresh.pop("replayed_from", None)  # also rebuilds the checkpoints
+                _install_snapshot(cache, fresh, layout); _refresh_views(cache, fresh, None, False)
+                data = fresh; done = len(cache["pending"])
+    else: raise StaleWriteError("storage kept changing; will retry")
+    with cache["lock"]:
+        cache["layout"] = layout; del cache["pending"][:done]
+
+# --- HISTORY CARDS ---
+HISTORY_PAGE_SIZE = 10
+
+# One day of the History tab as a single HTML block (instead of a column and two widgets per player).
+def day_card_html(day):
+    winner = day_result(day)[0]; scores = []
+    for p, stats in day["scores"].items():
+        wrong = f'<div class="day-wrong">{ICON_CROSS} {html.escape(stats["wrong_words_input"])}</div>' if stats.get("wrong_words_input") else ""
+        scores.append(f'<div>{html.escape(p)}: <b>{stats["score"] + (1 if p == winner else 0)}</b>{wrong}</div>')
+    result = f'<div class="day-result">Result: {html.escape(day["winner_log"])}</div>' if "winner_log" in day else ""
+    return (f'<div class="day-card"><div><b>{html.escape(day["date"])}</b> | {html.escape(day["solution"])}</div>'
+            f'{result}<div class="day-scores">{"".join(scores)}</div></div>')
+
+# Card HTML by date, filled in as pages are viewed; a replay drops the replayed dates' cards.
+# Cards are stored under the cache lock and only by sessions on the cache's version, so a
+# session rendering an older snapshot never puts its cards in the current version's dict.
+def build_day_cards(data):
+    return {}
+
+def update_day_cards(cards, data, from_date):
+    return {d: card for d, card in cards.items() if d < from_date}
+
+def day_card(cards, day):
+    card = cards.get(day["date"]); perf.cache_event("day_card", card is not None)
+    if card is None:
+        card = day_card_html(day); cache = _data_cache()
+        with cache["lock"]:
+            if st.session_state.get("data_version") == cache["version"]: cards[day["date"]] = card
+    return card
+
+def _shift_date(days, trigger):
+    mark_trigger(trigger); st.session_state.curr_date += timedelta(days=days)
+
+# Backfill: every parsed row goes in as one change, so one replay and one write.
+def _bulk_import(rows):
+    mark_trigger("bulk_import"); submit_change({"kind": "bulk", "rows": rows})
+    st.session_state["bulk_text"] = ""; st.toast(f"Imported {len(rows)} score(s).")
+
+def _history_filter_changed():
+    mark_trigger("history_filter"); st.session_state["history_page"] = 0
+
+def _history_page(step):
+    mark_trigger("history_page"); st.session_state["history_page"] = st.session_state.get("history_page", 0) + step
+
+# --- DERIVED VIEWS ---
+# Views computed from the data, cached next to the shared snapshot for one data version.
+# An edit that triggered an incremental replay updates them from the replayed date
+# (see submit_change); anything else drops them. Sessions on an older version build their own.
+DERIVED_VIEWS = {
+    "burn_index": (build_burn_index, update_burn_index),
+    "stats": (build_stats, update_stats),
+    "trend": (build_trend, update_trend),
+    "day_cards": (build_day_cards, update_day_cards),
+    "windows": (build_windows, update_windows),
+    "sim_features": (history_features, update_features),
+}
+
+def get_view(name, data):
+    cache = _data_cache(); version = st.session_state.get("data_version")
+    with cache["lock"]:
+        hit = cache["views_version"] == version and name in cache["views"]
+        perf.cache_event(f"view:{name}", hit)
+        if hit: return cache["views"][name]
+        with perf.phase(f"build:{name}"): view = DERIVED_VIEWS[name][0](data)
+        if version == cache["version"]:
+            if cache["views_version"] != version: cache["views"] = {}; cache["views_version"] = version
+            cache["views"][name] = view
+    return view
+
+# Archived seasons never change, so their data and Stats views are built once per file (the
+# mtime in the key picks up a re-archived file) and shared by every session.
+SEASON_VIEWS = ["stats", "windows", "trend"]
+
+@st.cache_resource(max_entries=8)
+def season_views(path, mtime):
+    data = load_season(path)
+    return data, {name: DERIVED_VIEWS[name][0](data) for name in SEASON_VIEWS}
 
 # --- STATS HELPERS ---
 def get_badges(player_name, player_data, history):
@@ -264,8 +388,78 @@ def get_badges(player_name, player_data, history):
         if penalties == 0: badges.append("🛡️")
     return " ".join(badges)
 
+# --- WORD CHECKS ---
+# Typed words missing from the bundled guess list, each with its nearest listed spellings.
+def unlisted_words(text):
+    index = word_index()
+    return {w: index.suggest(w) for w in (w.strip().upper() for w in text.split(",")) if w and w not in index}
+
+def describe_unlisted(unlisted):
+    return "; ".join(f"{w} (did you mean {', '.join(alts)}?)" if alts else w for w, alts in unlisted.items())
+
+# --- INSTRUMENTATION ---
+# Widgets that matter for performance tag the rerun they cause via on_change/on_click.
+def mark_trigger(name):
+    st.session_state["_perf_trigger"] = name
+
+def begin_rerun_metrics(scope="app"):
+    ss = st.session_state
+    first = "_perf_session" not in ss
+    if first: ss["_perf_session"] = uuid.uuid4().hex[:8]; ss["_perf_reruns"] = 0
+    if "_perf_open" in ss: perf.finish_rerun(ss.pop("_perf_open"), interrupted=True)
+    ss["_perf_reruns"] += 1
+    ss["_perf_open"] = perf.start_rerun(ss["_perf_session"], ss["_perf_reruns"], ss.pop("_perf_trigger", "page_load" if first else "other"), scope)
+
+# st.fragment with a timing phase. A fragment rerunning on its own skips the top and bottom
+# of the script, so it opens and closes its own rerun record (scope = the fragment's name).
+def fragment(name):
+    def wrap(body):
+        def run(*args):
+            ss = st.session_state; own = "_perf_open" not in ss
+            if own: begin_rerun_metrics(name)
+            with perf.phase(name): body(*args)
+            if own: perf.finish_rerun(ss.pop("_perf_open"))
+        return st.fragment(run)
+    return wrap
+
+def _ms_rows(mapping, label):
+    return [{label: k, **(v if isinstance(v, dict) else {"ms": v})} for k, v in mapping.items()]
+
+def performance_panel():
+    ss = st.session_state
+    mine = perf.recent_reruns(ss["_perf_session"])
+    st.caption(f"Session {ss['_perf_session']}: {ss['_perf_reruns']} reruns")
+    if mine:
+        last = mine[-1]
+        st.write(f"**Last rerun** ({last['trigger']}): {last['total_ms']} ms")
+        st.dataframe(_ms_rows(last["phases"], "Phase"), hide_index=True)
+        if last["calls"]: st.dataframe(_ms_rows(last["calls"], "Call"), hide_index=True)
+    by_trigger = {}
+    for r in perf.recent_reruns():
+        key = (r["trigger"], r.get("scope", "app"))
+        agg = by_trigger.setdefault(key, {"Trigger": key[0], "Scope": key[1], "reruns": 0, "total_ms": 0.0, "max_ms": 0.0, "storage_calls": 0})
+        agg["reruns"] += 1; agg["total_ms"] += r["total_ms"]; agg["max_ms"] = max(agg["max_ms"], r["total_ms"])
+        agg["storage_calls"] += sum(c["count"] for c in r["calls"].values())
+    if by_trigger:
+        st.write("**Reruns by trigger** (all sessions)")
+        st.dataframe([dict(a, avg_ms=round(a.pop("total_ms") / a["reruns"], 1)) for a in sorted(by_trigger.values(), key=lambda a: -a["total_ms"])], hide_index=True)
+    rates = perf.cache_hit_rates()
+    if rates:
+        st.write("**Cache hit rates**")
+        st.dataframe(_ms_rows(rates, "Cache"), hide_index=True)
+    replica = replica_status()
+    if replica:
+        synced = datetime.fromtimestamp(replica["synced_at"]).strftime("%H:%M:%S") if replica["synced_at"] else "never"
+        st.write(f"**Sheets replica**: {replica['backlog']} save(s) behind, last synced {synced}")
+        if replica["error"]: st.caption(f"Last error: {replica['error']}")
+    if perf.BACKGROUND["calls"]:
+        st.write("**Background writes**")
+        st.dataframe(_ms_rows(perf.BACKGROUND["calls"], "Call"), hide_index=True)
+    st.download_button("Export (JSON lines)", perf.export_jsonl(), file_name="wordle-perf.jsonl", mime="application/json")
+
 # --- MAIN APP UI ---
-data = load_data()
+begin_rerun_metrics()
+with perf.phase("load_data"): data = load_data()
 
 st.title(f"{ICON_PUZZLE} Wordle League")
 
@@ -292,43 +486,53 @@ for i, (name, p_data) in enumerate(sorted_players):
 
 st.write("---")
 
-# ACTION BAR
-c1, c2 = st.columns([1, 1])
-with c1:
-    search_term = st.text_input("Burn Checker", placeholder="Check word...", label_visibility="collapsed").upper().strip()
-with c2:
-    if st.button(f"{ICON_REFRESH} Updates", use_container_width=True):
-        st.cache_data.clear(); st.rerun()
-
-# --- SMART BURN CHECKER ---
-if search_term:
-    found_any = False
-    res_cols = st.columns(len(data["players"]))
-    for i, (p_name, p_data) in enumerate(data["players"].items()):
-        with res_cols[i]:
-            if search_term in p_data["burned"]:
-                # SCAN HISTORY FOR THE DATE
-                found_date = None
-                for day in data["history"]:
-                    if day["solution"] == search_term:
-                        found_date = day["date"]; break
-                    if p_name in day["scores"]:
-                        p_day = day["scores"][p_name]
-                        if "new_burns" in p_day and search_term in p_day["new_burns"]:
-                            found_date = day["date"]; break
-                
-                date_display = ""
-                if found_date:
-                    try:
-                        dt = datetime.strptime(found_date, "%Y-%m-%d")
-                        date_display = f" on {dt.strftime('%b %d, %Y')}"
-                    except: date_display = f" ({found_date})"
-                else: date_display = " (Legacy)"
-
-                st.error(f"{p_name}: BURNED{date_display}"); found_any = True
-            else: st.success(f"{p_name}: Safe")
-    if not found_any: st.caption(f"'{search_term}' is safe.")
-    st.write("---")
+# ACTION BAR + SMART BURN CHECKER
+# A fragment: checking a word reruns only this section.
+@fragment("burn_checker")
+def burn_checker(data):
+    c1, c2 = st.columns([1, 1])
+    with c1:
+        search_term = st.text_input("Burn Checker", placeholder="Check word...", label_visibility="collapsed",
+                                    on_change=mark_trigger, args=("burn_checker",)).upper().strip()
+    with c2:
+        if st.button(f"{ICON_REFRESH} Updates", use_container_width=True, on_click=mark_trigger, args=("updates",)):
+            invalidate_data(); st.rerun()
+    n_pending, write_error = pending_writes()
+    if write_error: st.error(f"Error saving: {write_error} (retrying)")
+    elif n_pending: st.caption(f"{ICON_REFRESH} Saving {n_pending} change(s)...")
+    replica = replica_status()
+    if replica and replica["error"]: st.warning(f"Sheets backup failing: {replica['error']} ({replica['backlog']} save(s) not copied yet, retrying)")
+    elif replica and replica["backlog"]: st.caption(f"{ICON_REFRESH} Copying {replica['backlog']} save(s) to Sheets...")
+
+    burn_index = get_view("burn_index", data)
+    if search_term:
+        found_any = False
+        if len(search_term) < 5:
+            suggestions = complete_words(burn_index, search_term)
+            if suggestions: st.caption(f"Burned words starting with '{search_term}': {', '.join(suggestions)}")
+            listed = word_index().complete(search_term)
+            if listed: st.caption(f"Words starting with '{search_term}': {', '.join(listed)}")
+        elif search_term not in word_index():
+            st.caption(f"Not in the word list: {describe_unlisted(unlisted_words(search_term))}")
+        res_cols = st.columns(len(data["players"]))
+        for i, (p_name, p_data) in enumerate(data["players"].items()):
+            with res_cols[i]:
+                is_burned, found_date = burn_status(burn_index, p_name, search_term)
+                if is_burned:
+                    date_display = ""
+                    if found_date:
+                        try:
+                            dt = datetime.strptime(found_date, "%Y-%m-%d")
+                            date_display = f" on {dt.strftime('%b %d, %Y')}"
+                        except: date_display = f" ({found_date})"
+                    else: date_display = " (Legacy)"
+
+                    st.error(f"{p_name}: BURNED{date_display}"); found_any = True
+                else: st.success(f"{p_name}: Safe")
+        if not found_any: st.caption(f"'{search_term}' is safe.")
+        st.write("---")
+
+burn_checker(data)
 
 # TABS (Rules Added)
 tab_play, tab_stats, tab_history, tab_rules, tab_library = st.tabs([
@@ -339,27 +543,26 @@ tab_play, tab_stats, tab_history, tab_rules, tab_library = st.tabs([
     f"{ICON_BOOKS} Library"
 ])
 
-with tab_play:
+# Date navigation and the entry forms rerun as a fragment; a submit reruns the whole app.
+@fragment("daily_tab")
+def daily_panel(data):
     if 'curr_date' not in st.session_state: st.session_state.curr_date = date.today()
     d_col1, d_col2, d_col3 = st.columns([1, 2, 1])
-    with d_col1:
-        if st.button("◀", use_container_width=True): st.session_state.curr_date -= timedelta(days=1); st.rerun()
-    with d_col3:
-        if st.button("▶", use_container_width=True): st.session_state.curr_date += timedelta(days=1); st.rerun()
+    with d_col1: st.button("◀", use_container_width=True, on_click=_shift_date, args=(-1, "date_prev"))
+    with d_col3: st.button("▶", use_container_width=True, on_click=_shift_date, args=(1, "date_next"))
     with d_col2:
         st.markdown(f"<h3 style='text-align: center; margin: 0;'>{st.session_state.curr_date.strftime('%b %d')}</h3>", unsafe_allow_html=True)
-        new_date = st.date_input("Jump", value=st.session_state.curr_date, label_visibility="collapsed")
-        if new_date != st.session_state.curr_date: st.session_state.curr_date = new_date; st.rerun()
+        st.date_input("Jump", key="curr_date", label_visibility="collapsed", on_change=mark_trigger, args=("date_picker",))
 
     date_str = str(st.session_state.curr_date)
-    existing_day = next((item for item in data["history"] if item["date"] == date_str), None)
+    existing_day = get_view("windows", data)["by_date"].get(date_str)
     if not existing_day: current_day_data = {"date": date_str, "solution": "", "victory_awarded": False, "scores": {}}
     else: current_day_data = existing_day
 
     # Spoiler Logic
     done_count = len(current_day_data["scores"]); total_p = len(data["players"])
     in_prog = (done_count > 0) and (done_count < total_p)
-    show_spoiler = st.checkbox("Show Solution", value=False)
+    show_spoiler = st.checkbox("Show Solution", value=False, on_change=mark_trigger, args=("show_solution",))
     if in_prog and not show_spoiler:
         st.info("🙈 Solution hidden until all submit.")
         solution = st.text_input("Solution", value=current_day_data["solution"], type="password", disabled=True).upper().strip()
@@ -375,44 +578,47 @@ with tab_play:
                 def_w = current_day_data["scores"][p_name].get("wrong_words_input", "") if has_played else ""
                 guesses = st.radio("Guesses", [1,2,3,4,5,6,"Fail"], index=3, key=f"g_{p_name}_{date_str}", horizontal=True)
                 wrong = st.text_area("Incorrect Words", value=def_w, key=f"w_{p_name}_{date_str}")
-                if st.form_submit_button("Submit"):
+                keep = st.checkbox("Allow words not in the word list", key=f"k_{p_name}_{date_str}")
+                if st.form_submit_button("Submit", on_click=mark_trigger, args=("submit",)):
+                    unlisted = {} if keep else unlisted_words(f"{solution},{wrong}")
                     if not solution: st.error("Solution required.")
+                    elif unlisted: st.error(f"Not in the word list: {describe_unlisted(unlisted)}. Fix them or tick the box to keep them.")
                     else:
-                        current_day_data["solution"] = solution
-                        current_day_data["scores"][p_name] = {"guesses": guesses, "wrong_words_input": wrong, "base": 0, "score": 0}
-                        if not existing_day: data["history"].insert(0, current_day_data)
-                        with st.spinner("Syncing..."): new_data = recalculate_history(data); save_data(new_data)
+                        merged = data_changed()
+                        submit_change({"kind": "score", "date": date_str, "player": p_name, "solution": solution, "guesses": guesses, "wrong_words_input": wrong})
+                        if merged: st.toast("Merged with newer scores from another session.")
                         st.success("Saved!"); st.rerun()
 
-with tab_stats:
+with tab_play: daily_panel(data)
+
+@fragment("stats_tab")
+def stats_panel(data):
     st.subheader("📊 Analytics")
+    seasons = list_seasons()
+    season = None
+    if seasons:
+        names = {s["name"]: s for s in seasons}
+        season = names.get(st.selectbox("Season", ["Current"] + list(reversed(names)), key="stats_season", on_change=mark_trigger, args=("season",)))
+    if season:
+        data, views = season_views(season["path"], os.path.getmtime(season["path"]))
+        st.caption(f"{season['first']} to {season['last']}, {season['days']} days (archived)")
+        view = views.get
+    else: view = lambda name: get_view(name, data)
     
     if not data["history"]:
         st.info("Play some games to see stats!")
     else:
         stat_cols = st.columns(len(data["players"]))
+        league_stats = view("stats")
         
         for i, (p_name, p_data) in enumerate(data["players"].items()):
             with stat_cols[i]:
-                games = 0; wins = 0; total_guesses = 0; head_to_head_wins = 0; ties = 0
-                counts = {1:0, 2:0, 3:0, 4:0, 5:0, 6:0, "Fail":0}
-                
-                for h in data["history"]:
-                    if p_name in h["scores"]:
-                        g = h["scores"][p_name].get("guesses")
-                        games += 1
-                        counts[g] += 1
-                        if g != "Fail": wins += 1; total_guesses += g
-                        
-                        w_log = h.get("winner_log", "")
-                        if f"{p_name} (+1)" in w_log: head_to_head_wins += 1
-                        elif "Tie" in w_log: ties += 1
-
-                avg = round(total_guesses / wins, 2) if wins > 0 else 0.0
+                p_stats = player_stats(league_stats, p_name)
+                games = p_stats["games"]; avg = p_stats["avg"]; head_to_head_wins = p_stats["h2h"]; ties = p_stats["ties"]
                 
                 pill_htmls = []
-                for k in [1, 2, 3, 4, 5, 6, "Fail"]:
-                    val = counts[k]
+                for k in GUESS_KEYS:
+                    val = p_stats["counts"].get(k, 0)
                     css = "guess-pill" if val > 0 else "guess-pill zero"
                     pill_htmls.append(f'<div class="{css}">{k}: {val}</div>')
                 pill_str = "".join(pill_htmls)
@@ -433,50 +639,72 @@ with tab_stats:
                 
         st.divider()
 
+        # LEADERBOARD (any date range, answered from prefix sums)
+        span = st.radio("Leaderboard", ["All-time", "7 days", "30 days", "90 days", "Custom"], horizontal=True, key="board_span",
+                        on_change=mark_trigger, args=("leaderboard",))
+        start = end = None
+        if span == "Custom":
+            picked = st.date_input("Range", value=(date.today() - timedelta(days=29), date.today()), key="board_range",
+                                   on_change=mark_trigger, args=("leaderboard",))
+            start, end = (list(map(str, picked)) + [None])[:2] if picked else (None, None)
+        elif span != "All-time": start = str(date.today() - timedelta(days=int(span.split()[0]) - 1))
+        board = window_totals(view("windows"), start, end)
+        st.dataframe([{"Player": p, "Points": t["points"], "Games": t["games"], "Avg": t["avg"], "H2H": t["h2h"], "Ties": t["ties"]}
+                      for p, t in sorted(board.items(), key=lambda x: -x[1]["points"])], hide_index=True, use_container_width=True)
+        st.divider()
+
         # TUG OF WAR
-        chronological = sorted(data["history"], key=lambda x: datetime.strptime(x["date"], "%Y-%m-%d"))
-        running_scores = {p: 0 for p in data["players"]}
-        trend_data = []
-        
-        for day in chronological:
-            for p, s in day["scores"].items(): running_scores[p] += s["score"]
-            if "winner_log" in day and "(+1)" in day["winner_log"]:
-                winner = day["winner_log"].split(" ")[0]
-                if winner in running_scores: running_scores[winner] += 1
-            for p, score in running_scores.items():
-                trend_data.append({"Date": day["date"], "Player": p, "Total Score": score})
-
-        if trend_data:
-            df_trend = pd.DataFrame(trend_data)
+        trend_mode = st.radio("Resolution", ["Auto", "Daily", "Weekly"], horizontal=True, key="trend_mode", on_change=mark_trigger, args=("trend_resolution",))
+        df_trend = trend_series(view("trend"), trend_mode)
+
+        if not df_trend.empty:
             line_chart = alt.Chart(df_trend).mark_line(point=True).encode(
                 x=alt.X('Date:T', axis=alt.Axis(format='%b %d')),
                 y='Total Score:Q',
                 color='Player',
                 tooltip=['Date', 'Player', 'Total Score']
             ).properties(title="Score History")
-            st.altair_chart(line_chart, use_container_width=True)
+            with perf.phase("altair_render"): st.altair_chart(line_chart, use_container_width=True)
+
+with tab_stats: stats_panel(data)
 
-with tab_history:
+with tab_history, perf.phase("history_tab"):
     st.subheader("Match History")
-    for idx, h in enumerate(data["history"]):
-        with st.container():
+    if data["history"]:
+        first = date.fromisoformat(min(h["date"] for h in data["history"])); last = date.fromisoformat(max(h["date"] for h in data["history"]))
+        f1, f2 = st.columns(2)
+        # The bounds are in the key, so a new first/last day resets the range instead of hiding it.
+        picked = f1.date_input("Dates", value=(first, last), min_value=first, max_value=last, key=f"history_dates_{first}_{last}",
+                               on_change=_history_filter_changed)
+        lo, hi = (list(picked) + [last])[:2] if picked else (first, last)  # one end picked so far: open-ended
+        wanted = set(f2.multiselect("Players", list(data["players"]), key="history_players", placeholder="All players", on_change=_history_filter_changed))
+        days = [h for h in data["history"] if str(lo) <= h["date"] <= str(hi) and (not wanted or wanted & h["scores"].keys())]
+
+        n_pages = max(1, -(-len(days) // HISTORY_PAGE_SIZE))
+        page = st.session_state["history_page"] = min(st.session_state.get("history_page", 0), n_pages - 1)
+        p1, p2, p3 = st.columns([1, 2, 1])
+        p1.button("◀ Newer", key="history_newer", disabled=page == 0, on_click=_history_page, args=(-1,), use_container_width=True)
+        p2.caption(f"Page {page + 1} of {n_pages} · {len(days)} days")
+        p3.button("Older ▶", key="history_older", disabled=page == n_pages - 1, on_click=_history_page, args=(1,), use_container_width=True)
+
+        cards = get_view("day_cards", data); offset = page * HISTORY_PAGE_SIZE
+        for idx, h in enumerate(days[offset:offset + HISTORY_PAGE_SIZE], offset):
             c1, c2 = st.columns([4, 1])
-            c1.write(f"**{h['date']}** | {h['solution']}")
-            if "winner_log" in h: c1.caption(f"Result: {h['winner_log']}")
+            c1.markdown(day_card(cards, h), unsafe_allow_html=True)
             with c2:
-                unique_key = f"del_{h['date']}_{idx}"
-                if st.button(f"{ICON_TRASH}", key=unique_key):
-                    data["history"].pop(idx)
-                    with st.spinner("Deleting..."): data = recalculate_history(data); save_data(data)
+                if st.button(f"{ICON_TRASH}", key=f"del_{h['date']}_{idx}", on_click=mark_trigger, args=("delete_day",)):
+                    submit_change({"kind": "delete_day", "date": h["date"]})
                     st.rerun()
-            cols = st.columns(len(h["scores"])) if h["scores"] else [st.container()]
-            for i, (p, stats) in enumerate(h["scores"].items()):
-                with cols[i]:
-                    is_win = (p in h.get('winner_log', '')) and ("+1" in h.get('winner_log', ''))
-                    total = stats['score'] + (1 if is_win else 0)
-                    st.write(f"{p}: **{total}**")
-                    if stats.get('wrong_words_input'): st.caption(f"{ICON_CROSS} {stats['wrong_words_input']}")
-            st.divider()
+        if not days: st.caption("No days match these filters.")
+
+# Editing the rule sets reruns only this fragment; each set replays the whole history.
+@fragment("rule_simulator")
+def rule_simulator(data):
+    st.caption("Replays the whole history under each rule set. Edit a row or add one to compare the standings.")
+    rows = st.data_editor(rules_table(PRESETS), num_rows="dynamic", hide_index=True, key="sim_rules", use_container_width=True)
+    rule_sets = rules_from_table(rows)
+    if rule_sets and data["players"]:
+        st.dataframe(compare_standings(get_view("sim_features", data), rule_sets), use_container_width=True)
 
 with tab_rules:
     st.header(f"{ICON_RULES} League Rules & Scoring")
@@ -512,13 +740,18 @@ with tab_rules:
         * **Tier 3 (Days 15+):** +9 pts per day.
     """)
 
-with tab_library:
+    st.subheader("4. What-If Simulator")
+    rule_simulator(data)
+
+with tab_library, perf.phase("library_tab"):
     st.subheader("Burned Word Library")
+    burn_index = get_view("burn_index", data)
     cols = st.columns(len(data["players"]))
-    for i, (p, val) in enumerate(data["players"].items()):
+    for i, p in enumerate(data["players"]):
         with cols[i]:
-            st.write(f"**{p}** ({len(val['burned'])})")
-            st.caption(", ".join(sorted(val["burned"])))
+            burned = sorted(burn_index["burned"].get(p, ()))
+            st.write(f"**{p}** ({len(burned)})")
+            st.caption(", ".join(burned))
 
 # ADMIN
 st.write(""); st.write("")
@@ -526,14 +759,37 @@ with st.expander(f"{ICON_GEAR} Admin & Roster"):
     c_add, c_del = st.columns(2)
     with c_add:
         new_player = st.text_input("New Name")
-        if st.button("Add Player"):
+        if st.button("Add Player", on_click=mark_trigger, args=("add_player",)):
             if new_player and new_player not in data["players"]:
-                data["players"][new_player] = {"score": 0, "clean_days": 0, "burned": [], "past_solutions": []}
-                save_data(data); st.rerun()
+                submit_change({"kind": "add_player", "name": new_player}); st.rerun()
     with c_del:
         p_edit = st.selectbox("Select Player", options=list(data["players"].keys()))
-        if st.button("Delete Player"): del data["players"][p_edit]; save_data(data); st.rerun()
+        if st.button("Delete Player", on_click=mark_trigger, args=("delete_player",)): submit_change({"kind": "delete_player", "name": p_edit}); st.rerun()
     st.divider()
-    if st.button("⚠️ Force Full Recalculate"):
-        with st.spinner("Replaying History..."): data = recalculate_history(data); save_data(data)
+    if st.button("⚠️ Force Full Recalculate", on_click=mark_trigger, args=("recalculate",)):
+        with st.spinner("Replaying History..."): submit_change({"kind": "recalculate"})
         st.success("Done!"); st.rerun()
+    st.divider()
+    # SEASON ROLLOVER: archive every day up to the season's last day; scores restart from zero.
+    c_name, c_end = st.columns(2)
+    season_name = c_name.text_input("Season Name", key="season_name", placeholder=f"{date.today().year} Season")
+    season_end = c_end.date_input("Last Day of Season", value=date.today() - timedelta(days=1), key="season_end")
+    if st.button("🗄️ Archive Season", disabled=not season_name.strip(), on_click=mark_trigger, args=("archive_season",)):
+        try:
+            change = {"kind": "archive_season", "name": season_name.strip(), "until": str(season_end)}
+            with st.spinner("Archiving..."): submit_change(change)
+        except (ValueError, OSError) as e: st.error(f"Could not archive: {e}")
+        else: st.toast(f"Archived {len(change['dates'])} days to {change['path']}"); st.rerun()
+    st.divider()
+    bulk_text = st.text_area("Bulk Import (share text or CSV)", key="bulk_text", height=150,
+                             placeholder="Alice\nWordle 1,234 4/6\nSolution: CRANE\nWords: SLATE, TRAIN\n\nor CSV: date,player,guesses,solution,wrong_words")
+    if bulk_text.strip():
+        rows, errors = parse_import(bulk_text, list(data["players"]), data["history"], dictionary=word_index())
+        for err in errors: st.error(err)
+        if rows: st.dataframe(rows, hide_index=True)
+        st.button(f"Import {len(rows)} score(s)", disabled=bool(errors) or not rows, on_click=_bulk_import, args=(rows,))
+
+with st.expander(f"{ICON_TOOL} Performance"):
+    performance_panel()
+
+perf.finish_rerun(st.session_state.pop("_perf_open"))
@@ -0,0 +1,129 @@
+import argparse
+import copy
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from league import build_burn_index, build_stats, build_trend, burn_status, calculate_day_stats, recalculate_history, trend_series
+from simulate import PRESETS, history_features, simulate_many
+from storage import HISTORY_COLUMNS, PLAYER_COLUMNS, SheetsClient, SheetsStorage, data_tables
+
+# Benchmarks for the hot paths on synthetic leagues. Results are JSON so runs from
+# different versions can be diffed:  python bench.py --players 4 8 --days 365 1095
+
+# --- SYNTHETIC LEAGUES ---
+GUESS_WEIGHTS = {1: 0.5, 2: 6, 3: 23, 4: 33, 5: 24, 6: 10, "Fail": 3.5}  # share of games, %
+LETTERS = "ABCDEFGHIKLMNOPRSTUWY"
+
+def _word(rng):
+    return "".join(rng.choice(LETTERS) for _ in range(5))
+
+# N players x D days of replayed history. Every wrong guess is listed as an incorrect word;
+# `reuse_rate` of them repeat a word already burned or solved, so penalties and grace show up.
+def synthetic_league(players=4, days=365, seed=0, play_rate=0.9, reuse_rate=0.15, start=date(2022, 1, 1)):
+    rng = random.Random(seed)
+    names = [f"Player{i + 1}" for i in range(players)]
+    vocab = [_word(rng) for _ in range(max(2000, days * 3))]
+    history = []; used = []
+    for d in range(days):
+        solution = rng.choice(vocab); scores = {}
+        for p_name in names:
+            if rng.random() > play_rate: continue
+            guesses = rng.choices(list(GUESS_WEIGHTS), weights=list(GUESS_WEIGHTS.values()))[0]
+            n_wrong = 6 if guesses == "Fail" else guesses - 1
+            wrong = [rng.choice(used) if used and rng.random() < reuse_rate else rng.choice(vocab) for _ in range(n_wrong)]
+            scores[p_name] = {"guesses": guesses, "wrong_words_input": ", ".join(wrong), "base": 0, "score": 0}
+            used.extend(wrong)
+        used.append(solution)
+        history.insert(0, {"date": str(start + timedelta(days=d)), "solution": solution, "victory_awarded": False, "scores": scores})
+    data = {"players": {p: {"score": 0, "clean_days": 0, "burned": [], "past_solutions": []} for p in names}, "history": history}
+    return recalculate_history(data)
+
+# Stand-in for the GSheets connection: the same read/update calls, worksheets held as DataFrames.
+# It has no gspread client, so SheetsStorage takes its full-rewrite path when saving.
+class MemorySheets:
+    client = None
+
+    def __init__(self, data):
+        columns = {"players": PLAYER_COLUMNS, "history": HISTORY_COLUMNS}
+        self.frames = {ws: pd.DataFrame([values for _, values in rows], columns=columns[ws]) for ws, rows in data_tables(data).items()}
+
+    def read(self, worksheet, ttl=None, **options):
+        return self.frames[worksheet].copy()
+
+    def update(self, worksheet, data):
+        self.frames[worksheet] = data.copy()
+
+# --- TIMING ---
+def _time(run, setup=lambda: None, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        arg = setup()
+        started = time.perf_counter(); run(arg); samples.append(time.perf_counter() - started)
+    return {"best_ms": round(min(samples) * 1000, 3), "median_ms": round(statistics.median(samples) * 1000, 3), "runs": repeat}
+
+def _todays_entry(data):
+    data = copy.deepcopy(data)
+    data["history"][0]["scores"][next(iter(data["players"]))] = {"guesses": 3, "wrong_words_input": "CRANE, SLATE", "base": 0, "score": 0}
+    return data
+
+def run_benchmarks(players, days, seed=0, repeat=5, lookups=1000):
+    data = synthetic_league(players, days, seed)
+    storage = SheetsStorage(SheetsClient(MemorySheets(data), per_minute=None))  # no request budget for timing runs
+    latest = data["history"][0]["date"]
+    sample_day = next(h for h in data["history"] if h["scores"])
+    p_day = next(iter(sample_day["scores"].values()))
+    burned = sorted({w for s in data["players"].values() for w in s["burned"]}) or ["CRANE"]
+    burned_set = set(burned)
+    words = [burned[i % len(burned)] for i in range(lookups)]
+    index = build_burn_index(data)
+    features = history_features(data)
+
+    def day_stats_batch(_):
+        for _ in range(lookups):
+            calculate_day_stats(p_day["guesses"], p_day["wrong_words_input"], sample_day["solution"], burned_set, set(), 3)
+
+    def burn_lookups(_):
+        for w in words:
+            for name in data["players"]: burn_status(index, name, w)
+
+    results = {
+        "load_parse": _time(lambda _: storage.load(), repeat=repeat),
+        "save_full": _time(lambda d: storage.save(d, None), lambda: data, repeat),
+        "recalculate_full": _time(recalculate_history, lambda: dict(copy.deepcopy(data), checkpoints=[]), repeat),
+        "recalculate_todays_entry": _time(lambda d: recalculate_history(d, latest), lambda: _todays_entry(data), repeat),
+        f"calculate_day_stats_x{lookups}": _time(day_stats_batch, repeat=repeat),
+        "stats_aggregation": _time(lambda _: build_stats(data), repeat=repeat),
+        "trend_build": _time(lambda _: trend_series(build_trend(data), "Auto"), repeat=repeat),
+        "burn_index_build": _time(lambda _: build_burn_index(data), repeat=repeat),
+        f"burn_checker_x{lookups}": _time(burn_lookups, repeat=repeat),
+        "whatif_features": _time(lambda _: history_features(data), repeat=repeat),
+        f"whatif_rule_sets_x{len(PRESETS)}": _time(lambda _: simulate_many(features, PRESETS), repeat=repeat),
+    }
+    return {"players": players, "days": days, "seed": seed, "results": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the league engine on synthetic data.")
+    parser.add_argument("--players", type=int, nargs="+", default=[4])
+    parser.add_argument("--days", type=int, nargs="+", default=[365, 1095])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    report = {
+        "python": platform.python_version(), "pandas": pd.__version__, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "leagues": [run_benchmarks(p, d, args.seed, args.repeat) for p in args.players for d in args.days],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f: f.write(text + "\n")
+    else: print(text)
+
+if __name__ == "__main__":
+    sys.exit(main())
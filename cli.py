@@ -0,0 +1,112 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+from league import apply_change, recalculate_history, validate_league
+
+# League maintenance without Streamlit, for cron jobs and scripts. A league file is either
+# JSON ({"players": ..., "history": ...}, as exported here) or a SQLite league (WORDLE_DB).
+#   python cli.py recalc league.db
+#   python cli.py validate league.json --words
+#   python cli.py export league.db --format csv --output history.csv
+#   python cli.py archive league.db --season "2024 Season" --until 2024-12-31
+
+def _is_json(path):
+    return path.lower().endswith(".json")
+
+def load_league(path):
+    if _is_json(path):
+        with open(path) as f: data = json.load(f)
+        if not isinstance(data, dict) or not {"players", "history"} <= data.keys():
+            raise ValueError(f"{path} is not a league file (needs \"players\" and \"history\")")
+        return data, None
+    if not os.path.exists(path): raise FileNotFoundError(f"no league file at {path}")
+    from storage import SQLiteStorage
+    storage = SQLiteStorage(path); data, layout, _ = storage.load()
+    return data, (storage, layout)
+
+def plain(data):
+    return {"players": data["players"], "history": data["history"]}
+
+def save_league(path, data, handle=None):
+    if _is_json(path):
+        with open(path, "w") as f: json.dump(plain(data), f, indent=1)
+        return
+    from storage import SQLiteStorage
+    storage, layout = handle if handle and handle[0].path == path else (SQLiteStorage(path), None)
+    storage.save(data, layout)
+
+def export_rows(data):
+    for day in sorted(data["history"], key=lambda x: x["date"]):
+        for p_name, s in day["scores"].items():
+            yield [day["date"], p_name, "X" if s.get("guesses") == "Fail" else s.get("guesses"), day["solution"], s.get("wrong_words_input", "")]
+
+def cmd_recalc(args):
+    data, handle = load_league(args.league)
+    before = {p: s.get("score") for p, s in data["players"].items()}
+    recalculate_history(data)
+    save_league(args.output or args.league, data, handle)
+    for p_name, s in data["players"].items():
+        change = "" if before.get(p_name) == s["score"] else f" (was {before.get(p_name)})"
+        print(f"{p_name}: {s['score']}{change}")
+    return 0
+
+def cmd_validate(args):
+    data, _ = load_league(args.league)
+    dictionary = None
+    if args.words:
+        from words import word_index
+        dictionary = word_index()
+    problems = validate_league(data, dictionary)
+    for problem in problems: print(problem)
+    print(f"{len(problems)} problem(s) in {len(data['history'])} day(s), {len(data['players'])} player(s)", file=sys.stderr)
+    return 1 if problems else 0
+
+def cmd_export(args):
+    data, _ = load_league(args.league)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json": json.dump(plain(data), out, indent=1); out.write("\n")
+        else:
+            # Same columns as the Admin bulk import, so an export can be re-imported.
+            writer = csv.writer(out)
+            writer.writerow(["date", "player", "guesses", "solution", "wrong_words"]); writer.writerows(export_rows(data))
+    finally:
+        if out is not sys.stdout: out.close()
+    return 0
+
+def cmd_archive(args):
+    from seasons import ARCHIVE_DIR, archive_season
+    data, handle = load_league(args.league)
+    path, dates = archive_season(args.season, data, args.until, args.dir or ARCHIVE_DIR)
+    apply_change(data, {"kind": "archive_season", "dates": dates}); recalculate_history(data)
+    save_league(args.league, data, handle)
+    print(f"{len(dates)} day(s) archived to {path}; {len(data['history'])} day(s) left")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalculate, validate, export or archive a local league file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("recalc", help="replay the whole history and save the result")
+    p.add_argument("league"); p.add_argument("--output", help="write here instead of back to the league file")
+    p.set_defaults(run=cmd_recalc)
+    p = commands.add_parser("validate", help="report problems; exit status 1 if there are any")
+    p.add_argument("league"); p.add_argument("--words", action="store_true", help="also check words against the bundled word list")
+    p.set_defaults(run=cmd_validate)
+    p = commands.add_parser("export", help="write the league as JSON or as CSV score rows")
+    p.add_argument("league"); p.add_argument("--format", choices=["json", "csv"], default="json"); p.add_argument("--output")
+    p.set_defaults(run=cmd_export)
+    p = commands.add_parser("archive", help="move every day up to --until into a season file and restart scores from zero")
+    p.add_argument("league"); p.add_argument("--season", required=True); p.add_argument("--until", required=True, help="last day, YYYY-MM-DD")
+    p.add_argument("--dir", help="archive directory (default $WORDLE_ARCHIVE_DIR or ./seasons)")
+    p.set_defaults(run=cmd_archive)
+    args = parser.parse_args(argv)
+    try: return args.run(args)
+    except (OSError, ValueError, sqlite3.DatabaseError) as e:  # missing or unreadable league file
+        print(f"error: {e}", file=sys.stderr); return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,525 @@
+import csv
+import io
+import re
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date
+
+# Scoring rules, history replay and the views derived from league data. No Streamlit here,
+# so the benchmarks (bench.py), the CLI (cli.py) and cron jobs drive the same code as app.py.
+# pandas and numpy are imported inside the view builders that need them, so importing the
+# scoring and replay engine stays fast.
+
+def guess_from_base(base_score):
+    map_score = {10:1, 8:2, 6:3, 4:4, 2:5, 1:6, 0:"Fail"}
+    return map_score.get(base_score, "-")
+
+# --- CORE MODEL ---
+# Inside a replay every word is interned once and referred to by an integer id; a player's
+# burned words and past solutions are kept in order (for serialisation) and as id sets (for
+# O(1) membership). data["players"] keeps the plain dict form, written back after the replay;
+# the typed states stay in data["states"] so the next replay can rewind them to a checkpoint.
+class WordTable:
+    __slots__ = ("ids", "words", "lock")
+
+    def __init__(self):
+        self.ids = {}; self.words = []; self.lock = threading.Lock()
+
+    def id(self, word):
+        i = self.ids.get(word)
+        if i is None:
+            with self.lock:  # the write-behind thread replays too
+                i = self.ids.get(word)
+                if i is None:
+                    word = sys.intern(word); self.words.append(word); i = self.ids[word] = len(self.words) - 1
+        return i
+
+    def ids_of(self, words):
+        ids = self.ids
+        try: return list(map(ids.__getitem__, words))
+        except KeyError: return [self.id(w) for w in words]
+
+WORDS = WordTable()
+
+@dataclass(slots=True)
+class PlayerState:
+    score: int = 0
+    clean_days: int = 0
+    burned: list = field(default_factory=list)          # word ids, in the order they burned
+    past_solutions: list = field(default_factory=list)  # word ids, first time solved
+    burned_set: set = field(default_factory=set)
+    solution_set: set = field(default_factory=set)
+
+    @classmethod
+    def restore(cls, stats, score, clean_days, n_burned, n_sols):
+        burned = WORDS.ids_of(stats["burned"][:n_burned]); sols = WORDS.ids_of(stats["past_solutions"][:n_sols])
+        return cls(score, clean_days, burned, sols, set(burned), set(sols))
+
+    def rewind(self, score, clean_days, n_burned, n_sols):
+        burned = self.burned[:n_burned]; sols = self.past_solutions[:n_sols]
+        return PlayerState(score, clean_days, burned, sols, set(burned), set(sols))
+
+    # Everything inside is immutable ints, so shallow container copies are a full copy.
+    def __deepcopy__(self, memo):
+        return PlayerState(self.score, self.clean_days, list(self.burned), list(self.past_solutions), set(self.burned_set), set(self.solution_set))
+
+    def burn(self, ids):
+        self.burned.extend(ids); self.burned_set.update(ids)
+
+    def solve(self, sol_id):
+        if sol_id not in self.solution_set: self.past_solutions.append(sol_id); self.solution_set.add(sol_id)
+
+    # `prior` is the dict this replay resumed from; its first `kept` (burned, solutions) words still hold.
+    def to_dict(self, prior=None, kept=(0, 0)):
+        words = WORDS.words; n_burned, n_sols = kept
+        burned = (prior["burned"][:n_burned] if prior else []) + [words[i] for i in self.burned[n_burned:]]
+        sols = (prior["past_solutions"][:n_sols] if prior else []) + [words[i] for i in self.past_solutions[n_sols:]]
+        return {"score": self.score, "clean_days": self.clean_days, "burned": burned, "past_solutions": sols}
+
+# --- CALCULATION LOGIC ---
+BASE_POINTS = {1: 10, 2: 8, 3: 6, 4: 4, 5: 2, 6: 1, "Fail": 0}
+
+def calculate_day_stats(guesses, wrong_words_str, solution, current_burned_set, current_solutions_set, current_streak):
+    return _day_stats(guesses, wrong_words_str, current_burned_set, current_solutions_set, current_streak)[0]
+
+# With `words` (a WordTable) the sets hold word ids and the ids of the day's new burns are
+# returned next to the stats; without it the sets hold the words themselves.
+def _day_stats(guesses, wrong_words_str, burned_set, solutions_set, streak, words=None):
+    base = BASE_POINTS.get(guesses, 0)
+    penalties = 0; penalty_log = []; new_burns_for_day = []; new_ids = []
+    for word in wrong_words_str.split(","):
+        word = word.strip().upper()
+        if not word: continue
+        key = word if words is None else words.id(word)
+        if key in burned_set: penalties += 2; penalty_log.append(f"{word} (Burned)"); continue
+        if key in solutions_set: penalty_log.append(f"{word} (Grace Used)")
+        new_burns_for_day.append(word if words is None else words.words[key]); new_ids.append(key)
+    bonus = 0; new_streak_val = streak
+    if penalties == 0:
+        new_streak_val += 1
+        tier = ((new_streak_val - 1) // 7) + 1
+        bonus = tier * 3
+    return {
+        "score": base - penalties + bonus, "base": base, "guesses": guesses, "penalties": penalties,
+        "bonus": bonus, "log": penalty_log, "new_burns": new_burns_for_day,
+        "new_streak": new_streak_val, "wrong_words_input": wrong_words_str
+    }, new_ids
+
+# --- REPLAY ENGINE ---
+# Each replay leaves one checkpoint per day (in chronological order) holding every
+# player's score, streak and the lengths of their burned/past_solutions lists.
+# Those lists only ever grow during a replay, so truncating them restores the state.
+def _checkpoint(states):
+    return {p: (s.score, s.clean_days, len(s.burned), len(s.past_solutions)) for p, s in states.items()}
+
+def _restore_checkpoint(data, checkpoint):
+    states = data.get("states", {})
+    return {p: states[p].rewind(*checkpoint[p]) if p in states else PlayerState.restore(s, *checkpoint[p])
+            for p, s in data["players"].items()}
+
+# Index of the first chronological day that must be replayed (0 = full replay).
+def _replay_start(data, chronological, from_date):
+    if from_date is None: return 0
+    checkpoints = data.get("checkpoints", [])
+    start = bisect_left([d["date"] for d in chronological], from_date)
+    if start == 0 or start > len(checkpoints): return 0
+    if any(p not in checkpoints[start - 1] for p in data["players"]): return 0
+    return start
+
+def recalculate_history(data, from_date=None):
+    chronological = sorted(data["history"], key=lambda x: x["date"])
+    start = _replay_start(data, chronological, from_date)
+    resumed = data["checkpoints"][start - 1] if start else {}
+    states = _restore_checkpoint(data, resumed) if start else {p: PlayerState() for p in data["players"]}
+    checkpoints = data.get("checkpoints", [])[:start]
+    for t in range(start, len(chronological)):
+        day = chronological[t] = dict(chronological[t], scores=dict(chronological[t]["scores"]))  # replayed days are new dicts
+        sol = day["solution"]; sol_id = WORDS.id(sol) if sol else None; daily_perf = {}
+        for p_name, p_state in states.items():
+            entry = day["scores"].get(p_name)
+            if entry is None: continue
+            raw_input = entry.get("wrong_words_input", "")
+            raw_guess = entry.get("guesses", guess_from_base(entry.get("base", 0)))
+            stats, burn_ids = _day_stats(raw_guess, raw_input, p_state.burned_set, p_state.solution_set, p_state.clean_days, WORDS)
+            p_state.score += stats["score"]
+            p_state.clean_days = stats["new_streak"]
+            p_state.burn(burn_ids)
+            if sol_id is not None: p_state.solve(sol_id)
+            day["scores"][p_name] = stats
+            daily_perf[p_name] = stats["base"] - stats["penalties"]
+        if daily_perf:
+            max_perf = max(daily_perf.values())
+            winners = [p for p, s in daily_perf.items() if s == max_perf]
+            day["winner_log"] = f"{winners[0]} (+1)" if len(winners) == 1 else "Tie (No Bonus)"
+            day["victory_awarded"] = True
+            if len(winners) == 1: states[winners[0]].score += 1
+        checkpoints.append(_checkpoint(states))
+    data["players"] = {p: s.to_dict(data["players"].get(p), resumed.get(p, (0, 0, 0, 0))[2:]) for p, s in states.items()}
+    data["states"] = states
+    data["checkpoints"] = checkpoints
+    data["replayed_from"] = from_date if start else None
+    data["history"] = list(reversed(chronological))
+    return data
+
+# Data fresh from storage has no replay state. It is carried over from `previous` (the
+# snapshot being replaced) when the league is unchanged, otherwise rebuilt by one full
+# replay, so the next edit can still replay from a checkpoint.
+def restore_replay_state(data, previous=None):
+    if previous and "checkpoints" in previous and previous["players"] == data["players"] and previous["history"] == data["history"]:
+        data["checkpoints"] = previous["checkpoints"]; data["states"] = previous["states"]
+    else: recalculate_history(data); data.pop("replayed_from", None)
+    return data
+
+# --- CHANGES ---
+# Edits are small dicts so they can be queued and re-applied to newer data after a conflict.
+# apply_change returns the date to replay from ("" = everything) or None if no replay is needed.
+# Like recalculate_history it never modifies the lists and dicts inside `data`, it replaces
+# the ones it changes, so edits can be made on a shallow copy: edit_copy(snapshot).
+def edit_copy(data):
+    return dict(data)
+
+def _edited_day(day):
+    return dict(day, scores=dict(day["scores"]))
+
+def apply_change(data, change):
+    kind = change["kind"]
+    if kind == "score":
+        history = data["history"] = list(data["history"])
+        idx = next((i for i, h in enumerate(history) if h["date"] == change["date"]), None)
+        if idx is None:
+            history.insert(0, {"date": change["date"], "solution": "", "victory_awarded": False, "scores": {}}); idx = 0
+        day = history[idx] = _edited_day(history[idx])
+        day["solution"] = change["solution"]
+        day["scores"][change["player"]] = {"guesses": change["guesses"], "wrong_words_input": change["wrong_words_input"], "base": 0, "score": 0}
+        return change["date"]
+    if kind == "bulk":
+        existing = {h["date"]: h for h in data["history"]}; days = {}
+        for row in change["rows"]:
+            day = days.get(row["date"])
+            if day is None:
+                day = days[row["date"]] = _edited_day(existing.get(row["date"], {"date": row["date"], "solution": "", "victory_awarded": False, "scores": {}}))
+            if row["player"] in day["scores"]: continue  # a backfill never replaces a recorded score
+            if row["solution"]: day["solution"] = row["solution"]
+            day["scores"][row["player"]] = {"guesses": row["guesses"], "wrong_words_input": row["wrong_words_input"], "base": 0, "score": 0}
+        data["history"] = [day for d, day in days.items() if d not in existing] + [days.get(h["date"], h) for h in data["history"]]
+        return min((row["date"] for row in change["rows"]), default=None)
+    if kind == "delete_day":
+        idx = next((i for i, h in enumerate(data["history"]) if h["date"] == change["date"]), None)
+        if idx is None: return None
+        data["history"] = data["history"][:idx] + data["history"][idx + 1:]
+        return change["date"]
+    if kind == "archive_season":
+        # The archived days move to a season file (seasons.py); the rest is replayed from zero.
+        dates = set(change["dates"])
+        data["history"] = [h for h in data["history"] if h["date"] not in dates]
+        return ""
+    if kind == "add_player":
+        if change["name"] in data["players"]: return None
+        data["players"] = dict(data["players"], **{change["name"]: {"score": 0, "clean_days": 0, "burned": [], "past_solutions": []}})
+    elif kind == "delete_player":
+        if change["name"] not in data["players"]: return None
+        data["players"] = {p: s for p, s in data["players"].items() if p != change["name"]}
+    elif kind == "recalculate": return ""
+    data.pop("checkpoints", None); data.pop("states", None)
+    return None
+
+# --- BULK IMPORT ---
+# Backfill comes as CSV (header row with date, player, guesses and optionally solution and
+# wrong_words; comma- or semicolon-separated, as spreadsheets export it) or as pasted Wordle
+# share text: a player's name on its own line (or before a colon), then their share lines
+# ("Wordle 1,234 4/6"), each optionally followed by "Solution: WORD" and "Words: WORD, WORD"
+# lines. Puzzle numbers count days from 2021-06-19.
+WORDLE_EPOCH = date(2021, 6, 19)
+SHARE_LINE = re.compile(r"Wordle\s+#?(\d[\d,. ]*?)\s+([1-6X])/6", re.IGNORECASE)
+FIVE_LETTERS = re.compile(r"[A-Z]{5}")
+
+CSV_COLUMNS = ("date", "player", "guesses")
+
+def _csv_records(text, delimiter=","):
+    reader = csv.DictReader(io.StringIO(text), delimiter=delimiter)
+    reader.fieldnames = [f.strip().lower() for f in reader.fieldnames]
+    for n, rec in enumerate(reader, 2):
+        yield n, rec.get("date") or "", rec.get("player") or "", rec.get("guesses") or "", rec.get("solution") or "", rec.get("wrong_words") or ""
+
+def _share_records(text):
+    player = ""; pending = None
+    for n, line in enumerate(text.splitlines(), 1):
+        line = line.strip(); key, _, value = line.partition(":")
+        if pending and key.strip().lower() in ("solution", "words"):
+            pending[4 if key.strip().lower() == "solution" else 5] = value; continue
+        if not re.search(r"[A-Za-z]", line): continue  # blank or the emoji grid
+        if pending: yield tuple(pending); pending = None
+        match = SHARE_LINE.search(line)
+        prefix = (line[:match.start()] if match else line).strip().rstrip(":").strip()
+        if prefix: player = prefix
+        if match:
+            puzzle = int(re.sub(r"\D", "", match.group(1)))
+            pending = [n, str(date.fromordinal(WORDLE_EPOCH.toordinal() + puzzle)), player, match.group(2), "", ""]
+    if pending: yield tuple(pending)
+
+# (rows ready for a "bulk" change, error messages). Nothing should be imported while there are errors.
+# Scores already in `history` are errors (backfill only fills gaps; delete the day to replace it).
+# With a `dictionary` (any container of words) words missing from it are errors too.
+def parse_import(text, players, history, today=None, dictionary=None):
+    today = str(today or date.today()); names = {p.lower(): p for p in players}
+    known = {h["date"]: h["solution"] for h in history if h["solution"]}
+    recorded = {(h["date"], p) for h in history for p in h["scores"]}
+    text = text.lstrip("\ufeff").strip(); header = text.split("\n", 1)[0]
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    columns = [c.strip().lower() for c in header.split(delimiter)]; is_csv = columns[0] in CSV_COLUMNS
+    if is_csv and not set(CSV_COLUMNS) <= set(columns): return [], [f"line 1: CSV header needs {', '.join(CSV_COLUMNS)} columns"]
+    rows = {}; solutions = {}; errors = []
+    for n, day, player, guesses, solution, words in (_csv_records(text, delimiter) if is_csv else _share_records(text)):
+        where = f"line {n}"; day = day.strip(); guesses = guesses.strip().upper(); solution = solution.strip().upper()
+        wrong = [w.upper() for w in re.split(r"[\s,;|]+", words) if w]
+        if player.strip().lower() not in names: errors.append(f"{where}: unknown player '{player.strip()}'"); continue
+        player = names[player.strip().lower()]
+        try:
+            if str(date.fromisoformat(day)) > today: errors.append(f"{where}: {day} is in the future"); continue
+        except ValueError: errors.append(f"{where}: bad date '{day}'"); continue
+        if guesses in ("X", "FAIL"): guesses = "Fail"
+        elif guesses in ("1", "2", "3", "4", "5", "6"): guesses = int(guesses)
+        else: errors.append(f"{where}: bad guess count '{guesses}'"); continue
+        bad = [w for w in wrong + ([solution] if solution else []) if not FIVE_LETTERS.fullmatch(w)]
+        if bad: errors.append(f"{where}: not 5-letter words: {', '.join(bad)}"); continue
+        unlisted = [w for w in wrong + ([solution] if solution else []) if dictionary is not None and w not in dictionary]
+        if unlisted: errors.append(f"{where}: not in the word list: {', '.join(unlisted)}"); continue
+        if (day, player) in recorded: errors.append(f"{where}: {player} already has a score for {day}"); continue
+        if (day, player) in rows: errors.append(f"{where}: {player} already has a row for {day}"); continue
+        if solution:
+            previous = solutions.get(day) or known.get(day)
+            if previous and previous != solution: errors.append(f"{where}: solution {solution} for {day} conflicts with {previous}"); continue
+            solutions[day] = solution
+        rows[(day, player)] = {"date": day, "player": player, "solution": solution, "guesses": guesses, "wrong_words_input": ", ".join(wrong)}
+    for day in sorted({d for d, _ in rows} - set(solutions) - set(known)): errors.append(f"{day}: no solution given")
+    if text and not rows and not errors: errors.append("nothing to import: no CSV header (date, player, guesses) or Wordle share lines found")
+    return sorted(rows.values(), key=lambda r: (r["date"], r["player"])), errors
+
+# --- VALIDATION ---
+# Problems in a league as messages (empty = clean): malformed days and entries, scores for
+# players not on the roster, words that are not 5 letters (or not in `dictionary`), and stored
+# totals that a fresh replay would change. Days too malformed to replay (no date, solution or
+# scores) are reported and the replay comparison is skipped.
+def validate_league(data, dictionary=None):
+    if not isinstance(data.get("players"), dict) or not isinstance(data.get("history"), list):
+        return ['league needs a "players" object and a "history" list']
+    problems = []; seen = set(); malformed = False
+    for day in data["history"]:
+        if not isinstance(day, dict): problems.append(f"{day!r}: not a day"); malformed = True; continue
+        d = day.get("date", "")
+        try: date.fromisoformat(d)
+        except (TypeError, ValueError): problems.append(f"{d!r}: bad date"); malformed = True
+        if d in seen: problems.append(f"{d}: listed twice")
+        seen.add(d)
+        sol = day.get("solution")
+        if not isinstance(sol, str): problems.append(f"{d}: no solution field"); malformed = True
+        elif sol and not FIVE_LETTERS.fullmatch(sol): problems.append(f"{d}: bad solution {sol!r}")
+        elif sol and dictionary is not None and sol not in dictionary: problems.append(f"{d}: solution {sol} not in the word list")
+        scores = day.get("scores")
+        if not isinstance(scores, dict): problems.append(f"{d}: no scores field"); malformed = True; scores = {}
+        for p_name, s in scores.items():
+            if not isinstance(s, dict) or not isinstance(s.get("wrong_words_input", ""), str):
+                problems.append(f"{d}: {p_name} has a malformed score"); malformed = True; continue
+            if p_name not in data["players"]: problems.append(f"{d}: score for unknown player {p_name!r}")
+            if s.get("guesses") not in BASE_POINTS: problems.append(f"{d}: {p_name} has bad guesses {s.get('guesses')!r}")
+            words = [w.strip().upper() for w in s.get("wrong_words_input", "").split(",") if w.strip()]
+            bad = [w for w in words if not FIVE_LETTERS.fullmatch(w) or (dictionary is not None and w not in dictionary)]
+            if bad: problems.append(f"{d}: {p_name} typed {', '.join(bad)} ({'not in the word list' if dictionary is not None else 'not 5 letters'})")
+    if malformed: return problems + ["replay check skipped until the days above are fixed"]
+    replayed = recalculate_history({"players": {p: {} for p in data["players"]}, "history": [dict(h, scores=dict(h["scores"])) for h in data["history"]]})
+    for p_name, stored in data["players"].items():
+        fresh = replayed["players"][p_name]
+        if not isinstance(stored, dict): problems.append(f"{p_name}: stored player is not an object"); continue
+        for key in ("score", "clean_days", "burned", "past_solutions"):
+            if stored.get(key) != fresh[key]: problems.append(f"{p_name}: stored {key} differs from a replay (run recalc)")
+    return problems
+
+# --- BURN INDEX ---
+# word -> [(player, date, cause)] with cause "burn", "grace" (past solution reused) or
+# "solution". "days" holds each date's entries so a replay from a date can be re-indexed
+# without rebuilding, "burned" is every player's burned-word set and "sorted" the word
+# list used for prefix search (rebuilt lazily after changes).
+def _index_day(index, day):
+    entries = []
+    for p_name, stats in day["scores"].items():
+        for word in stats.get("new_burns", []):
+            entries.append((word, p_name, "grace" if f"{word} (Grace Used)" in stats.get("log", []) else "burn"))
+        if day["solution"]: entries.append((day["solution"], p_name, "solution"))
+    index["days"].setdefault(day["date"], []).extend(entries)
+    for word, p_name, cause in entries: index["words"].setdefault(word, []).append((p_name, day["date"], cause))
+    index["sorted"] = None
+
+def build_burn_index(data):
+    index = {"words": {}, "days": {}, "burned": {}, "sorted": None}
+    for day in sorted(data["history"], key=lambda x: x["date"]): _index_day(index, day)
+    index["burned"] = {p: set(s["burned"]) for p, s in data["players"].items()}
+    return index
+
+# Returns a new index (sessions may still be reading the old one): days before `from_date`
+# and the word lists they alone touch are shared, the rest is re-indexed.
+def update_burn_index(index, data, from_date):
+    days = {d: entries for d, entries in index["days"].items() if d < from_date}
+    dropped = {}
+    for d, entries in index["days"].items():
+        if d >= from_date:
+            for word, p_name, cause in entries: dropped.setdefault(word, []).append((p_name, d, cause))
+    added = {"words": {}, "days": {}, "burned": {}, "sorted": None}
+    for day in sorted((h for h in data["history"] if h["date"] >= from_date), key=lambda x: x["date"]): _index_day(added, day)
+    words = dict(index["words"])
+    for word in dropped.keys() | added["words"].keys():
+        kept = list(words.get(word, []))
+        for entry in dropped.get(word, []): kept.remove(entry)
+        kept += added["words"].get(word, [])
+        if kept: words[word] = kept
+        else: words.pop(word, None)
+    days.update(added["days"])
+    return {"words": words, "days": days, "burned": {p: set(s["burned"]) for p, s in data["players"].items()}, "sorted": None}
+
+# (is_burned, date first burned or None for legacy burns with no recorded day)
+def burn_status(index, player, word):
+    if word not in index["burned"].get(player, ()): return False, None
+    dates = [d for p, d, cause in index["words"].get(word, []) if p == player and cause != "solution"]
+    return True, min(dates) if dates else None
+
+def complete_words(index, prefix, limit=8):
+    if index["sorted"] is None: index["sorted"] = sorted(set().union(*index["burned"].values()))
+    words = index["sorted"]; start = bisect_left(words, prefix); matches = []
+    for word in words[start:start + limit]:
+        if not word.startswith(prefix): break
+        matches.append(word)
+    return matches
+
+# --- STATS ENGINE ---
+GUESS_KEYS = [1, 2, 3, 4, 5, 6, "Fail"]
+
+# (winner or None, is_tie) read from winner_log by exact name, never by substring search.
+def day_result(day):
+    log = day.get("winner_log", "")
+    if log.endswith(" (+1)"): return log[:-len(" (+1)")], False
+    return None, log.startswith("Tie")
+
+def _blank_stats():
+    return {"games": 0, "wins": 0, "total_guesses": 0, "h2h": 0, "ties": 0, "counts": {k: 0 for k in GUESS_KEYS}}
+
+# Each day contributes (player, guesses, outcome) entries; aggregates are their running sums,
+# so re-indexing a day subtracts its old entries and adds the new ones.
+def _apply_stats(players, entries, sign):
+    for p_name, g, outcome in entries:
+        agg = players.setdefault(p_name, _blank_stats())
+        agg["games"] += sign; agg["counts"][g] = agg["counts"].get(g, 0) + sign
+        if isinstance(g, int): agg["wins"] += sign; agg["total_guesses"] += sign * g
+        if outcome == "win": agg["h2h"] += sign
+        elif outcome == "tie": agg["ties"] += sign
+
+def _stats_day(stats, day):
+    winner, tie = day_result(day)
+    entries = [(p_name, s.get("guesses"), "win" if p_name == winner else "tie" if tie else None) for p_name, s in day["scores"].items()]
+    stats["days"].setdefault(day["date"], []).extend(entries)
+    _apply_stats(stats["players"], entries, 1)
+
+def build_stats(data):
+    stats = {"players": {}, "days": {}}
+    for day in data["history"]: _stats_day(stats, day)
+    return stats
+
+# Returns new stats; the old ones are left as they were for sessions still reading them.
+def update_stats(stats, data, from_date):
+    updated = {"players": {p: dict(agg, counts=dict(agg["counts"])) for p, agg in stats["players"].items()},
+               "days": {d: entries for d, entries in stats["days"].items() if d < from_date}}
+    for d, entries in stats["days"].items():
+        if d >= from_date: _apply_stats(updated["players"], entries, -1)
+    for day in data["history"]:
+        if day["date"] >= from_date: _stats_day(updated, day)
+    return updated
+
+def player_stats(stats, p_name):
+    agg = stats["players"].get(p_name, _blank_stats())
+    return dict(agg, avg=round(agg["total_guesses"] / agg["wins"], 2) if agg["wins"] > 0 else 0.0)
+
+# --- ROLLING WINDOWS ---
+# Per-player daily deltas on the sorted date axis, kept as prefix sums: any date range's
+# totals are one subtraction per metric, O(players) whatever its length. "by_date" is the
+# date -> day lookup for the Daily tab.
+WINDOW_METRICS = ["points", "games", "wins", "total_guesses", "h2h", "ties"]
+
+def build_windows(data):
+    import numpy as np
+    days = sorted(data["history"], key=lambda x: x["date"]); players = list(data["players"]); col = {p: j for j, p in enumerate(players)}
+    rows = []
+    for t, day in enumerate(days, 1):
+        winner, tie = day_result(day)
+        for p_name, s in day["scores"].items():
+            if p_name not in col: continue
+            g = s.get("guesses"); solved = isinstance(g, int)
+            rows.append((t, col[p_name], s["score"] + (p_name == winner), 1, solved, g if solved else 0, p_name == winner, tie))
+    deltas = np.zeros((len(WINDOW_METRICS), len(days) + 1, len(players)), dtype=np.int64)
+    if rows:
+        rows = np.array(rows, dtype=np.int64); deltas[:, rows[:, 0], rows[:, 1]] = rows[:, 2:].T
+    return {"dates": [d["date"] for d in days], "by_date": {d["date"]: d for d in days}, "players": players, "prefix": deltas.cumsum(axis=1)}
+
+def update_windows(windows, data, from_date):
+    return build_windows(data)
+
+# {player: totals} for days in [start, end] (ISO dates, None = open-ended).
+def window_totals(windows, start=None, end=None):
+    dates = windows["dates"]
+    i = bisect_left(dates, start) if start else 0
+    j = max(i, bisect_right(dates, end) if end else len(dates))
+    totals = (windows["prefix"][:, j] - windows["prefix"][:, i]).tolist()
+    board = {}
+    for k, p_name in enumerate(windows["players"]):
+        agg = {m: totals[n][k] for n, m in enumerate(WINDOW_METRICS)}
+        board[p_name] = dict(agg, avg=round(agg["total_guesses"] / agg["wins"], 2) if agg["wins"] > 0 else 0.0)
+    return board
+
+# --- TREND SERIES ---
+MAX_TREND_POINTS = 120  # per player; "Auto" resolution downsamples longer seasons to this
+
+# Running totals as a date x player frame: one pivot of daily points plus a cumulative sum.
+def build_trend(data):
+    import pandas as pd
+    players = list(data["players"]); dates = sorted({day["date"] for day in data["history"]})
+    rows = [(day["date"], p, s["score"] + (1 if p == day_result(day)[0] else 0))
+            for day in data["history"] for p, s in day["scores"].items()]
+    if not rows or not players: return {"totals": pd.DataFrame()}
+    daily = pd.DataFrame(rows, columns=["Date", "Player", "Points"]).pivot_table(
+        index="Date", columns="Player", values="Points", aggfunc="sum", fill_value=0)
+    totals = daily.reindex(index=dates, columns=players, fill_value=0).cumsum()
+    totals.index = pd.to_datetime(totals.index)
+    return {"totals": totals}
+
+def update_trend(trend, data, from_date):
+    return build_trend(data)
+
+# Largest-Triangle-Three-Buckets: indices of `n` points that keep the visual shape of (x, y).
+def _lttb(x, y, n):
+    import numpy as np
+    size = len(x)
+    if n >= size or n < 3: return np.arange(size)
+    x = x.astype(float); y = y.astype(float)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    picked = [0]; a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(edges[i + 1], edges[i + 2] if i + 2 < len(edges) else size)
+        avg_x = x[nxt].mean(); avg_y = y[nxt].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area)); picked.append(a)
+    picked.append(size - 1)
+    return np.array(picked)
+
+# Long-format chart data. "Weekly" keeps each week's closing totals; "Auto" applies LTTB
+# per player once a season has more than `max_points` days; "Daily" plots every day.
+def trend_series(trend, mode="Auto", max_points=MAX_TREND_POINTS):
+    import pandas as pd
+    totals = trend["totals"]
+    if totals.empty: return pd.DataFrame(columns=["Date", "Player", "Total Score"])
+    if mode == "Weekly": totals = totals.resample("W").last().dropna(how="all")
+    series = totals.rename_axis("Date").reset_index().melt(id_vars="Date", var_name="Player", value_name="Total Score")
+    if mode == "Auto" and len(totals) > max_points:
+        series = pd.concat([
+            g.iloc[_lttb(g["Date"].to_numpy().astype("int64"), g["Total Score"].to_numpy(), max_points)]
+            for _, g in series.groupby("Player", sort=False)])
+    return series
@@ -0,0 +1,86 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Lightweight instrumentation for the hot paths. Each Streamlit rerun gets a record with its
+# phase timings, storage calls (count, bytes, time) and cache hits/misses; finished records
+# are kept in memory for the Performance panel and logged as one JSON line each on the
+# "wordle.perf" logger. Work done outside a rerun (the write-behind thread) is counted in
+# BACKGROUND instead.
+
+logger = logging.getLogger("wordle.perf")
+RECENT_RERUNS = 200
+
+_current = ContextVar("perf_record", default=None)
+_lock = threading.Lock()
+_recent = deque(maxlen=RECENT_RERUNS)
+BACKGROUND = {"calls": {}}
+CACHE_TOTALS = {}  # process-wide: cache name -> [hits, misses]
+
+# scope is "app" for a full script run or the fragment's name for a fragment-only rerun.
+def start_rerun(session, rerun, trigger, scope="app"):
+    record = {"session": session, "rerun": rerun, "trigger": trigger, "scope": scope, "started": time.time(),
+              "total_ms": 0.0, "phases": {}, "calls": {}, "cache": {}, "interrupted": False}
+    _current.set(record)
+    record["_t0"] = time.perf_counter()
+    return record
+
+# Closes a rerun record. Reruns cut short by st.rerun() are closed at the start of the next
+# one with interrupted=True, so their timing covers the work that actually ran.
+def finish_rerun(record, interrupted=False):
+    if "_t0" not in record: return record
+    record["total_ms"] = round((time.perf_counter() - record.pop("_t0")) * 1000, 3)
+    record["interrupted"] = interrupted
+    with _lock: _recent.append(record)
+    logger.info(json.dumps(record, default=str))
+    return record
+
+@contextmanager
+def phase(name):
+    record = _current.get(); started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if record is not None:
+            record["phases"][name] = round(record["phases"].get(name, 0.0) + (time.perf_counter() - started) * 1000, 3)
+
+def _add_call(calls, kind, nbytes, seconds):
+    entry = calls.setdefault(kind, {"count": 0, "bytes": 0, "ms": 0.0})
+    entry["count"] += 1; entry["bytes"] += int(nbytes); entry["ms"] = round(entry["ms"] + seconds * 1000, 3)
+
+def record_call(kind, nbytes=0, seconds=0.0):
+    record = _current.get()
+    if record is not None: _add_call(record["calls"], kind, nbytes, seconds)
+    else:
+        with _lock: _add_call(BACKGROUND["calls"], kind, nbytes, seconds)
+
+@contextmanager
+def timed_call(kind):
+    # Yields a dict; set "bytes" on it once the payload size is known.
+    info = {"bytes": 0}; started = time.perf_counter()
+    try:
+        yield info
+    finally:
+        record_call(kind, info["bytes"], time.perf_counter() - started)
+
+def cache_event(name, hit):
+    record = _current.get()
+    if record is not None:
+        counts = record["cache"].setdefault(name, [0, 0]); counts[0 if hit else 1] += 1
+    with _lock:
+        totals = CACHE_TOTALS.setdefault(name, [0, 0]); totals[0 if hit else 1] += 1
+
+def recent_reruns(session=None):
+    with _lock: records = list(_recent)
+    return [r for r in records if session is None or r["session"] == session]
+
+def cache_hit_rates():
+    with _lock: totals = {name: list(counts) for name, counts in CACHE_TOTALS.items()}
+    return {name: {"hits": h, "misses": m, "hit_rate": round(h / (h + m), 3) if h + m else None} for name, (h, m) in totals.items()}
+
+def export_jsonl(session=None):
+    return "\n".join(json.dumps(r, default=str) for r in recent_reruns(session)) + "\n"
@@ -0,0 +1,76 @@
+import copy
+import glob
+import json
+import os
+import re
+
+from league import recalculate_history
+
+# Season archives: a finished season's days frozen into one zstd-compressed Parquet file, one
+# row per (day, player) score, with the season's final player state in the file metadata.
+# The live league keeps only the current season (which starts from zero), so loads and
+# replays stay bounded by one season. pyarrow comes with Streamlit; it is imported lazily.
+
+ARCHIVE_DIR = os.environ.get("WORDLE_ARCHIVE_DIR", "seasons")
+SCORE_FIELDS = ["guesses", "score", "base", "penalties", "bonus", "new_streak", "wrong_words_input", "log", "new_burns"]
+META_KEY = b"wordle.season"
+
+def _schema():
+    import pyarrow as pa
+    return pa.schema([
+        ("date", pa.string()), ("solution", pa.string()), ("winner_log", pa.string()), ("victory_awarded", pa.bool_()),
+        ("player", pa.string()), ("guesses", pa.string()), ("score", pa.int32()), ("base", pa.int32()), ("penalties", pa.int32()),
+        ("bonus", pa.int32()), ("new_streak", pa.int32()), ("wrong_words_input", pa.string()),
+        ("log", pa.list_(pa.string())), ("new_burns", pa.list_(pa.string())),
+    ])
+
+def season_path(name, directory=ARCHIVE_DIR):
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9_-]+", "-", name).strip("-") + ".parquet")
+
+# Writes every day up to `until` (inclusive) to the season's file and returns (path, dates).
+# The caller then drops those dates from the live league ("archive_season" change).
+def archive_season(name, data, until, directory=ARCHIVE_DIR):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    days = [h for h in data["history"] if h["date"] <= until]
+    if not days: raise ValueError(f"no days on or before {until}")
+    path = season_path(name, directory)
+    if os.path.exists(path): raise FileExistsError(f"season {name!r} is already archived")
+    season = recalculate_history({"players": {p: {} for p in data["players"]}, "history": copy.deepcopy(days)})
+    rows = []
+    for day in reversed(season["history"]):
+        fields = {"date": day["date"], "solution": day["solution"], "winner_log": day.get("winner_log", ""), "victory_awarded": bool(day.get("victory_awarded"))}
+        if not day["scores"]: rows.append(dict(fields, player=None))
+        for p_name, s in day["scores"].items():
+            rows.append(dict(fields, player=p_name, **{k: s.get(k) for k in SCORE_FIELDS}))
+            rows[-1]["guesses"] = str(s.get("guesses", ""))  # 1-6 or "Fail"
+    meta = {"name": name, "first": min(h["date"] for h in days), "last": max(h["date"] for h in days), "days": len(days),
+            "players": season["players"]}
+    table = pa.Table.from_pylist(rows, schema=_schema().with_metadata({META_KEY: json.dumps(meta)}))
+    os.makedirs(directory, exist_ok=True)
+    pq.write_table(table, path + ".tmp", compression="zstd"); os.replace(path + ".tmp", path)
+    return path, [h["date"] for h in days]
+
+# Archived seasons, oldest first, read from the file footers only.
+def list_seasons(directory=ARCHIVE_DIR):
+    import pyarrow.parquet as pq
+    seasons = []
+    for path in glob.glob(os.path.join(directory, "*.parquet")):
+        meta = json.loads(pq.read_schema(path).metadata[META_KEY]); meta.pop("players")
+        seasons.append(dict(meta, path=path))
+    return sorted(seasons, key=lambda s: s["first"])
+
+# An archived season as league data (final players, history newest first), for the Stats views.
+def load_season(path):
+    import pyarrow.parquet as pq
+    table = pq.read_table(path); meta = json.loads(table.schema.metadata[META_KEY])
+    days = {}
+    for row in table.to_pylist():
+        day = days.setdefault(row["date"], {"date": row["date"], "solution": row["solution"], "winner_log": row["winner_log"],
+                                            "victory_awarded": row["victory_awarded"], "scores": {}})
+        if row["player"] is None: continue
+        stats = {k: row[k] for k in SCORE_FIELDS}
+        stats["guesses"] = int(stats["guesses"]) if stats["guesses"].isdigit() else stats["guesses"]
+        stats["log"] = stats["log"] or []; stats["new_burns"] = stats["new_burns"] or []
+        day["scores"][row["player"]] = stats
+    return {"players": meta["players"], "history": sorted(days.values(), key=lambda x: x["date"], reverse=True)}
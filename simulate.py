@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+# What-if scoring: replays the whole history under other rule sets. Which words burned and
+# which were graces does not depend on the points, so one pass over the replayed history
+# extracts day x player arrays (guess, burned hits, grace uses) and every rule set is then a
+# handful of NumPy operations over them. Many rule sets are spread over a process pool.
+
+@dataclass(frozen=True)
+class RuleSet:
+    name: str = "Current"
+    base: tuple = (10, 8, 6, 4, 2, 1, 0)  # points for 1-6 guesses, then Fail
+    burn_penalty: int = 2
+    grace_penalty: int = 0                # reusing a past solution
+    tier_days: int = 7                    # clean days per streak tier
+    tier_bonus: int = 3                   # bonus per tier on a clean day
+    victory_points: int = 1
+
+# A rule set costs ~50 ns per day x player cell and starting the pool ~1 s, so the pool only
+# pays off for big sweeps: below this many cells (rule sets x days x players) it runs inline.
+POOL_MIN_CELLS = 50_000_000
+PRESETS = [
+    RuleSet(),
+    RuleSet("No streak bonus", tier_bonus=0),
+    RuleSet("Harsh burns", burn_penalty=4, grace_penalty=1),
+    RuleSet("Flat base", base=(6, 6, 5, 4, 3, 2, 0)),
+]
+
+# Rule sets as flat rows for an editable table, and back (incomplete rows are skipped, and a
+# repeated name gets a " (2)" suffix, since standings columns are keyed by name).
+GUESS_COLUMNS = ["1", "2", "3", "4", "5", "6", "Fail"]
+RULE_COLUMNS = {"Burn": "burn_penalty", "Grace": "grace_penalty", "Tier days": "tier_days", "Tier bonus": "tier_bonus", "Victory": "victory_points"}
+
+def rules_table(rule_sets):
+    return [dict({"Name": r.name}, **dict(zip(GUESS_COLUMNS, r.base)), **{col: getattr(r, attr) for col, attr in RULE_COLUMNS.items()})
+            for r in rule_sets]
+
+def rules_from_table(rows):
+    if hasattr(rows, "to_dict"): rows = rows.to_dict("records")
+    rule_sets = []; taken = set()
+    for row in rows:
+        values = [row.get(c) for c in GUESS_COLUMNS + list(RULE_COLUMNS)]
+        if not row.get("Name") or any(v is None or v != v for v in values): continue  # v != v: NaN from an empty cell
+        values = [int(v) for v in values]
+        name = base = str(row["Name"]); n = 1
+        while name in taken: n += 1; name = f"{base} ({n})"
+        taken.add(name)
+        rule_sets.append(RuleSet(name, tuple(values[:7]), *values[7:]))
+    return rule_sets
+
+def history_features(data):
+    days = sorted(data["history"], key=lambda x: x["date"]); players = list(data["players"]); col = {p: j for j, p in enumerate(players)}
+    shape = (len(days), len(players))
+    guess = np.full(shape, -1, dtype=np.int8); hits = np.zeros(shape, dtype=np.int64); graces = np.zeros(shape, dtype=np.int64)
+    for t, day in enumerate(days):
+        for p_name, s in day["scores"].items():
+            if p_name not in col: continue
+            g = s.get("guesses"); log = s.get("log", [])
+            guess[t, col[p_name]] = g - 1 if isinstance(g, int) and 1 <= g <= 6 else 6
+            hits[t, col[p_name]] = sum(entry.endswith("(Burned)") for entry in log)
+            graces[t, col[p_name]] = sum(entry.endswith("(Grace Used)") for entry in log)
+    return {"players": players, "guess": guess, "hits": hits, "graces": graces}
+
+def update_features(features, data, from_date):
+    return history_features(data)
+
+# Same rules as calculate_day_stats and the victory point in recalculate_history, with the
+# constants taken from `rules`: {"points": per-player totals, "victories": per-player counts}.
+def simulate(features, rules):
+    played = features["guess"] >= 0
+    base = np.asarray(rules.base, dtype=np.int64)[features["guess"]]
+    penalties = features["hits"] * rules.burn_penalty + features["graces"] * rules.grace_penalty
+    clean = played & (penalties == 0)
+    streak = np.cumsum(clean, axis=0)
+    bonus = np.where(clean, ((streak - 1) // max(rules.tier_days, 1) + 1) * rules.tier_bonus, 0)
+    perf = np.where(played, base - penalties, np.iinfo(np.int64).min)
+    top = played & (perf == perf.max(axis=1, keepdims=True)) if perf.size else played
+    victories = (top & (top.sum(axis=1, keepdims=True) == 1)).sum(axis=0)
+    points = np.where(played, base - penalties + bonus, 0).sum(axis=0) + victories * rules.victory_points
+    return {"points": points, "victories": victories}
+
+def simulate_many(features, rule_sets, workers=None):
+    run = partial(simulate, features)
+    workers = workers or os.cpu_count() or 1
+    if len(rule_sets) * features["guess"].size < POOL_MIN_CELLS or workers < 2: return [run(rules) for rules in rule_sets]
+    # spawn, not fork: the caller is usually a threaded Streamlit server
+    with ProcessPoolExecutor(max_workers=min(workers, len(rule_sets)), mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(run, rule_sets, chunksize=max(1, len(rule_sets) // workers)))
+
+# Side-by-side standings: one points and one rank column per rule set, ordered by the first.
+def compare_standings(features, rule_sets, workers=None):
+    table = pd.DataFrame(index=pd.Index(features["players"], name="Player"))
+    for rules, result in zip(rule_sets, simulate_many(features, rule_sets, workers)):
+        table[rules.name] = result["points"]
+        table[f"{rules.name} rank"] = table[rules.name].rank(ascending=False, method="min").astype(int)
+    return table.sort_values(rule_sets[0].name, ascending=False) if rule_sets else table
@@ -0,0 +1,418 @@
+import copy
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+
+import perf
+
+# --- STORAGE BACKENDS ---
+# Every backend offers load() -> (data, layout, warnings) and save(data, layout) -> layout.
+# "layout" is whatever the backend needs to write only what changed since the last
+# load/save (row positions and last-written values); None forces a full rewrite.
+# Backends that can cheaply version their contents also put a "stamp" in the layout and
+# raise StaleWriteError from save() when someone else has written since that stamp.
+
+class StaleWriteError(Exception):
+    pass
+
+PLAYER_COLUMNS = ["Name", "Score", "Clean_Days", "Burned", "Past_Solutions"]
+HISTORY_COLUMNS = ["Date", "Solution", "Winner_Log", "Victory_Awarded", "Scores_JSON"]
+
+# Rows as (key, cell values) in column order; players are keyed by name, days by date.
+def player_rows(data):
+    return [(name, [name, stats["score"], stats["clean_days"], "|".join(stats["burned"]), "|".join(stats["past_solutions"])])
+            for name, stats in data["players"].items()]
+
+def history_rows(data):
+    return [(h["date"], [h["date"], h["solution"], h.get("winner_log", ""), h.get("victory_awarded", False), json.dumps(h["scores"])])
+            for h in data["history"]]
+
+def data_tables(data):
+    return {"players": player_rows(data), "history": history_rows(data)}
+
+# Layout of one table: which key sits on which row, plus the row values last read/written there.
+# None means the table can't be diffed safely (unexpected columns, duplicate keys).
+def table_layout(columns, expected_columns, keys, rows):
+    rows = dict(rows)
+    if list(columns) != expected_columns or len(set(keys)) != len(keys) or set(keys) != set(rows): return None
+    return {"keys": list(keys), "rows": rows}
+
+def keyed_layout(tables):
+    return {t: table_layout([], [], [k for k, _ in rows], rows) for t, rows in tables.items()}
+
+def _diffable(layout, tables):
+    return bool(layout) and all(layout.get(t) is not None and len(dict(rows)) == len(rows) for t, rows in tables.items())
+
+# (changed, added, removed) keys between a table layout and its new rows.
+def diff_rows(layout, new_rows):
+    new = dict(new_rows)
+    changed = [k for k, values in new_rows if k in layout["rows"] and layout["rows"][k] != values]
+    added = [k for k, _ in new_rows if k not in layout["rows"]]
+    removed = [k for k in layout["keys"] if k not in new]
+    return changed, added, removed
+
+def _split_pipes(col):
+    text = col.fillna("").astype(str)
+    return [parts if parts != [""] else [] for parts in text.str.split("|")]
+
+# Decodes every Scores_JSON cell in one json.loads call; falls back to per-cell decoding
+# only when the bulk decode fails. Returns the dicts and the positions of malformed cells.
+def _decode_scores(col):
+    texts = col.where(col.notna(), "").astype(str).str.strip()
+    texts = texts.where(texts != "", "{}").tolist()
+    try:
+        decoded = json.loads("[" + ",".join(texts) + "]")
+        if len(decoded) != len(texts): raise ValueError("row count mismatch")
+    except ValueError:
+        decoded = []
+        for t in texts:
+            try: decoded.append(json.loads(t))
+            except ValueError: decoded.append(None)
+    bad = [i for i, d in enumerate(decoded) if not isinstance(d, dict)]
+    for i in bad: decoded[i] = {}
+    return decoded, bad
+
+# Column-wise parse of the two worksheets into (data, layout, warnings).
+def parse_frames(df_players, df_history):
+    import pandas as pd
+    warnings = []
+    players_dict = {
+        name: {"score": score, "clean_days": clean_days, "burned": burned, "past_solutions": sols}
+        for name, score, clean_days, burned, sols in zip(
+            df_players["Name"], df_players["Score"].astype(int).tolist(), df_players["Clean_Days"].astype(int).tolist(),
+            _split_pipes(df_players["Burned"]), _split_pipes(df_players["Past_Solutions"]))
+    }
+
+    # Convert to Datetime; bad dates get a dummy date instead of being deleted
+    df_history["Date"] = pd.to_datetime(df_history["Date"], errors="coerce")
+    if df_history["Date"].isnull().any():
+        warnings.append("Some dates were unreadable. Moved to bottom.")
+        df_history["Date"] = df_history["Date"].fillna(pd.Timestamp("1900-01-01"))
+
+    sheet_dates = df_history["Date"].dt.strftime("%Y-%m-%d")
+    df_sorted = df_history.sort_values(by="Date", ascending=False)
+    scores, bad_rows = _decode_scores(df_sorted["Scores_JSON"])
+    dates = sheet_dates.loc[df_sorted.index].tolist()
+    if bad_rows: warnings.append(f"Unreadable scores on {len(bad_rows)} day(s): {', '.join(dates[i] for i in bad_rows)}")
+
+    history_list = [
+        {"date": d, "solution": sol, "winner_log": log, "victory_awarded": awarded, "scores": sc}
+        for d, sol, log, awarded, sc in zip(
+            dates, df_sorted["Solution"].where(df_sorted["Solution"].notna(), "?").tolist(),
+            df_sorted["Winner_Log"].where(df_sorted["Winner_Log"].notna(), "").tolist(),
+            df_sorted["Victory_Awarded"].astype(bool).tolist(), scores)
+    ]
+    data = {"players": players_dict, "history": history_list}
+    layout = {
+        "players": table_layout(df_players.columns, PLAYER_COLUMNS, list(df_players["Name"]), player_rows(data)),
+        "history": table_layout(df_history.columns, HISTORY_COLUMNS, sheet_dates.tolist(), history_rows(data)),
+    }
+    return data, layout, warnings
+
+# --- SHEETS CLIENT ---
+# Every Sheets request of the process goes through one SheetsClient (storage is a shared
+# resource). It keeps requests under a per-minute budget, retries rate-limit and transient
+# server errors with exponential backoff, and lets concurrent reads of a worksheet share one
+# request. The transport is anything with read(worksheet, ttl), update(worksheet, data) and
+# optionally client._open_spreadsheet() (the GSheetsConnection, or a local fake); clock and
+# sleep can be swapped too, so budget and backoff can be exercised without waiting.
+SHEETS_REQUESTS_PER_MINUTE = int(os.environ.get("WORDLE_SHEETS_RPM", "60"))  # Google's default per-user quota
+RETRY_STATUSES = {429, 500, 502, 503}
+RETRY_ATTEMPTS = 5
+BACKOFF_SECONDS = 1.0       # first retry waits 0.5-1 s, doubling each time
+BACKOFF_MAX_SECONDS = 32.0
+
+def _http_status(error):
+    status = getattr(getattr(error, "response", None), "status_code", None) or getattr(error, "code", None)
+    if isinstance(status, int): return status
+    return 429 if "RATE_LIMIT_EXCEEDED" in str(error) or "Quota exceeded" in str(error) else None
+
+class SheetsClient:
+    def __init__(self, transport, per_minute=SHEETS_REQUESTS_PER_MINUTE, clock=time.monotonic, sleep=time.sleep):
+        self.transport = transport; self.per_minute = per_minute; self.clock = clock; self.sleep = sleep
+        self._sent = deque(); self._budget = threading.Lock()
+        self._reads = {}; self._reads_lock = threading.Lock()
+        self._target = None; self._target_lock = threading.Lock()
+
+    # Blocks until one more request fits: at most per_minute in any 60 s (None = no budget).
+    def _acquire(self):
+        if self.per_minute is None: return
+        with self._budget:
+            while True:
+                now = self.clock()
+                while self._sent and now - self._sent[0] >= 60: self._sent.popleft()
+                if len(self._sent) < self.per_minute: self._sent.append(now); return
+                wait = 60 - (now - self._sent[0])
+                perf.record_call("sheets.throttle", 0, wait); self.sleep(wait)
+
+    # Runs request(info) within the budget, retrying retryable errors; request sets info["bytes"].
+    def _call(self, kind, request):
+        delay = BACKOFF_SECONDS
+        for attempt in range(RETRY_ATTEMPTS):
+            self._acquire()
+            try:
+                with perf.timed_call(kind) as info: return request(info)
+            except Exception as e:
+                if _http_status(e) not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS - 1: raise
+            wait = random.uniform(delay / 2, delay); delay = min(delay * 2, BACKOFF_MAX_SECONDS)
+            perf.record_call("sheets.backoff", 0, wait); self.sleep(wait)
+
+    # A read of a worksheet that is already being read waits for that request instead of
+    # sending its own; every caller gets its own copy of the frame (parsing modifies it).
+    def read(self, worksheet):
+        with self._reads_lock:
+            flight = self._reads.get(worksheet); leader = flight is None
+            if leader: flight = self._reads[worksheet] = {"done": threading.Event()}
+        perf.cache_event("sheets.read", not leader)
+        if leader:
+            def request(info):
+                df = self.transport.read(worksheet=worksheet, ttl=0); info["bytes"] = df.memory_usage(deep=True).sum()
+                return df
+            try: flight["result"] = self._call("sheets.read", request)
+            except Exception as e: flight["error"] = e
+            finally:
+                with self._reads_lock: del self._reads[worksheet]
+                flight["done"].set()
+        else: flight["done"].wait()
+        if "error" in flight: raise flight["error"]
+        return copy.copy(flight["result"])
+
+    def update(self, worksheet, df):
+        def request(info):
+            info["bytes"] = df.memory_usage(deep=True).sum(); self.transport.update(worksheet=worksheet, data=df)
+        self._call("sheets.update", request)
+
+    # gspread handle and worksheet ids for batched writes; None on read-only (public) connections.
+    def spreadsheet(self):
+        with self._target_lock:
+            if self._target is None:
+                open_spreadsheet = getattr(getattr(self.transport, "client", None), "_open_spreadsheet", None)
+                if open_spreadsheet is None: return None
+                def request(info):
+                    sheet = open_spreadsheet()
+                    return {"sheet": sheet, "ids": {ws.title: ws.id for ws in sheet.worksheets()}}
+                self._target = self._call("sheets.metadata", request)
+            return self._target
+
+    # First-column values (the row keys, header excluded) of each worksheet, in one request.
+    def key_columns(self, worksheets):
+        sheet = self.spreadsheet()["sheet"]
+        def request(info):
+            found = sheet.values_batch_get([f"'{ws}'!A2:A" for ws in worksheets]); info["bytes"] = len(json.dumps(found))
+            return {ws: [row[0] if row else "" for row in r.get("values", [])] for ws, r in zip(worksheets, found["valueRanges"])}
+        return self._call("sheets.keys", request)
+
+    # A batchUpdate is applied atomically: every request in it lands or none does.
+    def batch_update(self, body):
+        sheet = self.spreadsheet()["sheet"]
+        def request(info):
+            info["bytes"] = len(json.dumps(body)); return sheet.batch_update(body)
+        return self._call("sheets.batch_update", request)
+
+# --- GOOGLE SHEETS ---
+def _cell(value):
+    if isinstance(value, bool): return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)): return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+def _row_data(values):
+    return {"values": [_cell(v) for v in values]}
+
+# Sheets API requests turning `layout` into `new_rows`: in-place row updates for edited keys,
+# one append for new keys and row deletes (bottom-up) for removed keys. Row 0 is the header.
+def _delta_requests(sheet_id, layout, new_rows):
+    requests = []; new = dict(new_rows)
+    changed, added, removed = diff_rows(layout, new_rows)
+    position = {k: i + 1 for i, k in enumerate(layout["keys"])}
+    for key in changed:
+        r = position[key]
+        requests.append({"updateCells": {
+            "range": {"sheetId": sheet_id, "startRowIndex": r, "endRowIndex": r + 1, "startColumnIndex": 0, "endColumnIndex": len(new[key])},
+            "rows": [_row_data(new[key])], "fields": "userEnteredValue"}})
+    if added:
+        requests.append({"appendCells": {"sheetId": sheet_id, "rows": [_row_data(new[k]) for k in added], "fields": "userEnteredValue"}})
+    for r in sorted((position[k] for k in removed), reverse=True):
+        requests.append({"deleteDimension": {"range": {"sheetId": sheet_id, "dimension": "ROWS", "startIndex": r, "endIndex": r + 1}}})
+    return requests, {"keys": [k for k in layout["keys"] if k in new] + added, "rows": new}
+
+# Requests rewriting a whole worksheet: clear every value, then append the header and rows.
+def _rewrite_requests(sheet_id, columns, rows):
+    return [{"updateCells": {"range": {"sheetId": sheet_id}, "fields": "userEnteredValue"}},
+            {"appendCells": {"sheetId": sheet_id, "rows": [_row_data(columns)] + [_row_data(values) for _, values in rows], "fields": "userEnteredValue"}}]
+
+# Row keys as parse_frames derives them, so they compare with a layout's keys.
+def _sheet_keys(ws, values):
+    if ws != "history": return [str(v) for v in values]
+    import pandas as pd
+    dates = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce")
+    return dates.fillna(pd.Timestamp("1900-01-01")).dt.strftime("%Y-%m-%d").tolist()
+
+class SheetsStorage:
+    # `conn` is a SheetsClient, or a transport (see SheetsClient) to wrap in one.
+    def __init__(self, conn):
+        self.client = conn if isinstance(conn, SheetsClient) else SheetsClient(conn)
+
+    def load(self):
+        df_players = self.client.read("players"); df_history = self.client.read("history")
+        with perf.phase("parse"): return parse_frames(df_players, df_history)
+
+    # Writes only the changed rows of both worksheets in one batchUpdate. Returns the new
+    # layout, or None when a delta isn't possible and a full rewrite is needed. The requests
+    # address rows by position, and the layout can be a snapshot old, so the key columns are
+    # re-read first: rows sorted, added or deleted outside the app raise StaleWriteError (the
+    # caller reloads and merges) rather than being overwritten. Sheets has no other version.
+    def _write_delta(self, layout, tables):
+        if not _diffable(layout, tables): return None
+        target = self.client.spreadsheet()
+        if target is None: return None
+        requests = []; new_layout = {}
+        for ws, rows in tables.items():
+            ws_requests, new_layout[ws] = _delta_requests(target["ids"][ws], layout[ws], rows)
+            requests.extend(ws_requests)
+        if not requests: return new_layout
+        found = self.client.key_columns(list(tables))
+        if any(_sheet_keys(ws, found[ws]) != [str(k) for k in layout[ws]["keys"]] for ws in tables):
+            raise StaleWriteError("rows were added, removed or moved in the sheet since it was read")
+        self.client.batch_update({"requests": requests})
+        return new_layout
+
+    # Both worksheets in one batchUpdate too, so a failed write can't leave them out of step.
+    # Without a gspread handle it falls back to one update per worksheet.
+    def _write_full(self, tables):
+        columns = {"players": PLAYER_COLUMNS, "history": HISTORY_COLUMNS}
+        target = self.client.spreadsheet()
+        if target is not None:
+            self.client.batch_update({"requests": [r for ws, rows in tables.items() for r in _rewrite_requests(target["ids"][ws], columns[ws], rows)]})
+        else:
+            import pandas as pd
+            for ws, rows in tables.items(): self.client.update(ws, pd.DataFrame([values for _, values in rows], columns=columns[ws]))
+        return {ws: table_layout(columns[ws], columns[ws], [k for k, _ in rows], rows) for ws, rows in tables.items()}
+
+    def save(self, data, layout):
+        tables = data_tables(data)
+        return self._write_delta(layout, tables) or self._write_full(tables)
+
+# --- SQLITE ---
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY, position INTEGER NOT NULL, score INTEGER NOT NULL, clean_days INTEGER NOT NULL,
+    burned TEXT NOT NULL, past_solutions TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY, solution TEXT, winner_log TEXT, victory_awarded INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS scores (
+    date TEXT NOT NULL REFERENCES days(date) ON DELETE CASCADE, player TEXT NOT NULL, position INTEGER NOT NULL,
+    guesses TEXT, score INTEGER, stats TEXT NOT NULL, PRIMARY KEY (date, player));
+CREATE INDEX IF NOT EXISTS scores_player ON scores(player, date);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+"""
+
+# Local league file (WAL mode). One connection shared by all sessions, serialised by a lock.
+class SQLiteStorage:
+    def __init__(self, path):
+        self.path = path; self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.db.executescript(SQLITE_SCHEMA)
+
+    def load(self):
+        with self._lock:
+            stamp = self._stamp()  # read first: a write landing mid-load can only cause a spurious conflict
+            players = self.db.execute("SELECT name, score, clean_days, burned, past_solutions FROM players ORDER BY position").fetchall()
+            days = self.db.execute("SELECT date, solution, winner_log, victory_awarded FROM days ORDER BY date DESC").fetchall()
+            scores = self.db.execute("SELECT date, player, stats FROM scores ORDER BY date, position").fetchall()
+        by_date = {}
+        for d, p_name, stats in scores: by_date.setdefault(d, {})[p_name] = json.loads(stats)
+        data = {
+            "players": {name: {"score": score, "clean_days": clean_days, "burned": burned.split("|") if burned else [],
+                               "past_solutions": sols.split("|") if sols else []}
+                        for name, score, clean_days, burned, sols in players},
+            "history": [{"date": d, "solution": sol, "winner_log": log or "", "victory_awarded": bool(awarded), "scores": by_date.get(d, {})}
+                        for d, sol, log, awarded in days],
+        }
+        return data, dict(keyed_layout(data_tables(data)), stamp=stamp), []
+
+    def _stamp(self):
+        return self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def _write_days(self, days):
+        for day in days:
+            self.db.execute("INSERT INTO days (date, solution, winner_log, victory_awarded) VALUES (?, ?, ?, ?) ON CONFLICT(date) DO UPDATE SET "
+                            "solution = excluded.solution, winner_log = excluded.winner_log, victory_awarded = excluded.victory_awarded",
+                            (day["date"], day["solution"], day.get("winner_log", ""), int(bool(day.get("victory_awarded", False)))))
+            self.db.execute("DELETE FROM scores WHERE date = ?", (day["date"],))
+            self.db.executemany("INSERT INTO scores (date, player, position, guesses, score, stats) VALUES (?, ?, ?, ?, ?, ?)",
+                                [(day["date"], p_name, i, str(s.get("guesses", "")), s.get("score"), json.dumps(s))
+                                 for i, (p_name, s) in enumerate(day["scores"].items())])
+
+    # The roster is a handful of rows and is always rewritten (it also carries the display
+    # order); days are diffed against the layout so a submit touches one day's rows.
+    def save(self, data, layout):
+        tables = data_tables(data)
+        days = {h["date"]: h for h in data["history"]}
+        with self._lock, self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            if layout and layout.get("stamp") is not None and layout["stamp"] != self._stamp():
+                raise StaleWriteError("league file changed since it was loaded")
+            self.db.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+            if _diffable(layout, tables):
+                h_changed, h_added, h_removed = diff_rows(layout["history"], tables["history"])
+            else:
+                self.db.execute("DELETE FROM days")
+                h_changed, h_added, h_removed = list(days), [], []
+            self.db.execute("DELETE FROM players")
+            self.db.executemany("INSERT INTO players (name, position, score, clean_days, burned, past_solutions) VALUES (?, ?, ?, ?, ?, ?)",
+                                [(values[0], i, *values[1:]) for i, (_, values) in enumerate(tables["players"])])
+            self.db.executemany("DELETE FROM days WHERE date = ?", [(k,) for k in h_removed])
+            self._write_days(days[k] for k in h_changed + h_added)
+            stamp = self._stamp()
+        return dict(keyed_layout(tables), stamp=stamp)
+
+# --- SYNC (SQLITE HOT STORE + SHEETS REPLICA) ---
+# Reads and writes hit SQLite; the latest saved state is replicated to Sheets by a background
+# thread. Saves that arrive while a replication is running coalesce into the next one.
+# replica_status() reports how many saves Sheets is behind and why, if it is failing.
+class SyncStorage:
+    RETRY_SECONDS = 30
+
+    def __init__(self, hot, replica):
+        self.hot = hot; self.replica = replica
+        self.replica_layout = None; self.last_error = None; self.synced_at = None
+        self._saves = self._replicated = 0
+        self._pending = None; self._cond = threading.Condition()
+        threading.Thread(target=self._replicate, name="sheets-replica", daemon=True).start()
+
+    def load(self):
+        data, layout, warnings = self.hot.load()
+        if not data["players"] and not data["history"]:  # first run: seed the hot store from Sheets
+            data, self.replica_layout, warnings = self.replica.load()
+            layout = self.hot.save(data, None)
+        return data, layout, warnings
+
+    def save(self, data, layout):
+        layout = self.hot.save(data, layout)
+        with self._cond: self._pending = copy.deepcopy(data); self._saves += 1; self._cond.notify()
+        return layout
+
+    def replica_status(self):
+        return {"backlog": self._saves - self._replicated, "error": self.last_error and str(self.last_error), "synced_at": self.synced_at}
+
+    def _replicate(self):
+        while True:
+            with self._cond:
+                while self._pending is None: self._cond.wait()
+                data, self._pending = self._pending, None; saves = self._saves
+            try:
+                self.replica_layout = self.replica.save(data, self.replica_layout)
+                self.last_error = None; self._replicated = saves; self.synced_at = time.time()
+            except Exception as e:
+                self.last_error = e; self.replica_layout = None
+                with self._cond:
+                    if self._pending is None: self._pending = data
+                time.sleep(self.RETRY_SECONDS)
@@ -0,0 +1,74 @@
+import copy
+from types import SimpleNamespace
+
+import pandas as pd
+
+from storage import HISTORY_COLUMNS, PLAYER_COLUMNS, data_tables
+
+# Local stand-in for a Google Sheets connection, covering everything SheetsStorage uses:
+# read/update like GSheetsConnection, and through client._open_spreadsheet() a spreadsheet
+# that applies batchUpdate (updateCells, appendCells, deleteDimension) atomically and answers
+# values_batch_get. Worksheets are grids of rows with the header as row 0.
+#   failures: exceptions raised by the next requests, one per request (e.g. RateLimited())
+#   gate:     when set to an Event, reads wait for it (to hold a read in flight)
+
+class RateLimited(Exception):
+    def __init__(self):
+        super().__init__("Quota exceeded for quota metric 'Read requests'")
+        self.response = SimpleNamespace(status_code=429)
+
+class FakeSheets:
+    def __init__(self, data=None):
+        tables = data_tables(data) if data else {"players": [], "history": []}
+        columns = {"players": PLAYER_COLUMNS, "history": HISTORY_COLUMNS}
+        self.grids = {ws: [list(columns[ws])] + [list(values) for _, values in rows] for ws, rows in tables.items()}
+        self.ids = {ws: i for i, ws in enumerate(self.grids)}
+        self.calls = []; self.failures = []; self.gate = None
+        self.client = SimpleNamespace(_open_spreadsheet=lambda: self)
+
+    def _request(self, kind):
+        self.calls.append(kind)
+        if self.failures: raise self.failures.pop(0)
+
+    # --- connection ---
+    def read(self, worksheet, ttl=None, **options):
+        self._request("read")
+        if self.gate is not None: self.gate.wait()
+        grid = self.grids[worksheet]
+        return pd.DataFrame(grid[1:], columns=grid[0])
+
+    def update(self, worksheet, data):
+        self._request("update")
+        self.grids[worksheet] = [list(data.columns)] + data.values.tolist()
+
+    # --- spreadsheet ---
+    def worksheets(self):
+        return [SimpleNamespace(title=ws, id=i) for ws, i in self.ids.items()]
+
+    def values_batch_get(self, ranges):
+        self._request("values_batch_get")
+        found = []
+        for r in ranges:  # only the "'title'!A2:A" form SheetsStorage sends
+            grid = self.grids[r.split("!")[0].strip("'")]
+            found.append({"range": r, "values": [[row[0]] if row and row[0] != "" else [] for row in grid[1:]]})
+        return {"valueRanges": found}
+
+    def batch_update(self, body):
+        self._request("batch_update")
+        grids = copy.deepcopy(self.grids); by_id = {i: ws for ws, i in self.ids.items()}
+        for request in body["requests"]:
+            (kind, r), = request.items()
+            if kind == "updateCells":
+                grid = grids[by_id[r["range"]["sheetId"]]]
+                if "rows" not in r: grid[:] = []; continue  # whole-sheet clear
+                start = r["range"]["startRowIndex"]
+                if start + len(r["rows"]) > len(grid): raise ValueError("updateCells outside the grid")
+                for i, row in enumerate(r["rows"]): grid[start + i] = [_value(c) for c in row["values"]]
+            elif kind == "appendCells": grids[by_id[r["sheetId"]]].extend([_value(c) for c in row["values"]] for row in r["rows"])
+            elif kind == "deleteDimension":
+                rg = r["range"]; del grids[by_id[rg["sheetId"]]][rg["startIndex"]:rg["endIndex"]]
+            else: raise ValueError(f"unsupported request {kind}")
+        self.grids = grids
+
+def _value(cell):
+    return next(iter(cell["userEnteredValue"].values()))
@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+
+import pytest
+
+import cli
+from bench import synthetic_league
+from seasons import list_seasons
+from storage import SQLiteStorage
+
+@pytest.fixture
+def league_file(tmp_path):
+    data = synthetic_league(3, 40, seed=2)
+    path = tmp_path / "league.json"; path.write_text(json.dumps(cli.plain(data)))
+    return str(path), data
+
+def test_recalc_restores_stored_totals(league_file, tmp_path, capsys):
+    path, data = league_file
+    broken = json.loads(open(path).read()); broken["players"]["Player1"]["score"] = 0
+    with open(path, "w") as f: json.dump(broken, f)
+    assert cli.main(["recalc", path, "--output", str(tmp_path / "fixed.json")]) == 0
+    assert json.loads((tmp_path / "fixed.json").read_text())["players"] == data["players"]
+    assert f"Player1: {data['players']['Player1']['score']} (was 0)" in capsys.readouterr().out
+
+def test_recalc_sqlite_league(league_file, tmp_path):
+    _, data = league_file; db = str(tmp_path / "league.db")
+    stale = cli.plain(data); stale["players"] = {p: dict(s, score=0) for p, s in stale["players"].items()}
+    SQLiteStorage(db).save(stale, None)
+    assert cli.main(["recalc", db]) == 0
+    assert SQLiteStorage(db).load()[0]["players"] == data["players"]
+
+def test_validate_clean_league(league_file):
+    assert cli.main(["validate", league_file[0]]) == 0
+
+def test_validate_reports_problems_with_status_1(league_file, capsys):
+    path, _ = league_file
+    data = json.loads(open(path).read())
+    data["history"].append({"date": "2099-01-01"})  # no solution, no scores
+    data["players"]["Player2"]["score"] += 5
+    with open(path, "w") as f: json.dump(data, f)
+    assert cli.main(["validate", path]) == 1
+    out = capsys.readouterr().out
+    assert "2099-01-01: no solution field" in out and "2099-01-01: no scores field" in out and "replay check skipped" in out
+
+def test_export_csv_can_be_reimported(league_file, tmp_path):
+    path, data = league_file; out = tmp_path / "scores.csv"
+    assert cli.main(["export", path, "--format", "csv", "--output", str(out)]) == 0
+    rows = list(csv.reader(out.open()))
+    assert rows[0] == ["date", "player", "guesses", "solution", "wrong_words"]
+    assert len(rows) - 1 == sum(len(h["scores"]) for h in data["history"])
+
+def test_export_json(league_file, capsys):
+    assert cli.main(["export", league_file[0]]) == 0
+    assert json.loads(capsys.readouterr().out) == cli.plain(league_file[1])
+
+def test_archive_moves_days_to_a_season_file(league_file, tmp_path):
+    path, data = league_file; first = min(h["date"] for h in data["history"])
+    until = sorted(h["date"] for h in data["history"])[29]
+    assert cli.main(["archive", path, "--season", "Opening", "--until", until, "--dir", str(tmp_path / "seasons")]) == 0
+    assert [(s["name"], s["first"], s["last"], s["days"]) for s in list_seasons(str(tmp_path / "seasons"))] == [("Opening", first, until, 30)]
+    assert len(json.loads(open(path).read())["history"]) == 10
+
+@pytest.mark.parametrize("argv", [
+    ["validate", "missing.db"],
+    ["validate", "not_a_league.json"],
+    ["validate", "corrupt.db"],
+    ["archive", "league.json", "--season", "Too early", "--until", "2000-01-01"],
+])
+def test_unreadable_input_exits_with_status_2(league_file, tmp_path, argv, capsys):
+    (tmp_path / "not_a_league.json").write_text('{"players": {}}')
+    (tmp_path / "corrupt.db").write_text("not a database")
+    argv = [argv[0], os.path.join(tmp_path, argv[1])] + argv[2:] + (["--dir", str(tmp_path / "seasons")] if argv[0] == "archive" else [])
+    assert cli.main(argv) == 2
+    assert capsys.readouterr().err.startswith("error: ")
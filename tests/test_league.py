@@ -0,0 +1,195 @@
+import copy
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench import synthetic_league
+from fake_sheets import FakeSheets
+from league import (apply_change, edit_copy, build_burn_index, build_stats, build_trend, build_windows, calculate_day_stats, guess_from_base,
+                    parse_import, player_stats, recalculate_history, restore_replay_state, update_burn_index, update_stats,
+                    update_trend, update_windows, window_totals)
+from storage import SheetsClient, SheetsStorage
+
+# The replay as it was before checkpoints, interned words and typed player state: the
+# reference every faster path must reproduce exactly.
+def plain_replay(data):
+    data = {"players": {p: {"score": 0, "clean_days": 0, "burned": [], "past_solutions": []} for p in data["players"]},
+            "history": copy.deepcopy(data["history"])}
+    chronological = sorted(data["history"], key=lambda x: x["date"])
+    for day in chronological:
+        sol = day["solution"]; daily_perf = {}
+        for p_name, p_state in data["players"].items():
+            if p_name not in day["scores"]: continue
+            entry = day["scores"][p_name]
+            raw_guess = entry.get("guesses", guess_from_base(entry.get("base", 0)))
+            stats = calculate_day_stats(raw_guess, entry.get("wrong_words_input", ""), sol, set(p_state["burned"]),
+                                        set(p_state["past_solutions"]), p_state["clean_days"])
+            p_state["score"] += stats["score"]; p_state["clean_days"] = stats["new_streak"]
+            p_state["burned"].extend(stats["new_burns"])
+            if sol and sol not in p_state["past_solutions"]: p_state["past_solutions"].append(sol)
+            day["scores"][p_name] = stats; daily_perf[p_name] = stats["base"] - stats["penalties"]
+        if daily_perf:
+            winners = [p for p, s in daily_perf.items() if s == max(daily_perf.values())]
+            day["winner_log"] = f"{winners[0]} (+1)" if len(winners) == 1 else "Tie (No Bonus)"
+            day["victory_awarded"] = True
+            if len(winners) == 1: data["players"][winners[0]]["score"] += 1
+    data["history"] = list(reversed(chronological))
+    return data
+
+def assert_same_league(data, expected):
+    assert data["players"] == expected["players"]
+    assert data["history"] == expected["history"]
+
+# Views compare by value; arrays and frames element-wise.
+def assert_same_view(view, expected):
+    if isinstance(expected, dict):
+        assert view.keys() == expected.keys()
+        for k in expected: assert_same_view(view[k], expected[k])
+    elif isinstance(expected, np.ndarray): np.testing.assert_array_equal(view, expected)
+    elif isinstance(expected, pd.DataFrame): pd.testing.assert_frame_equal(view, expected)
+    else: assert view == expected
+
+@pytest.fixture
+def league():
+    return synthetic_league(4, 120, seed=3)
+
+def middle_day(data, offset=60):
+    return sorted(data["history"], key=lambda x: x["date"])[offset]
+
+# --- REPLAY ---
+def test_full_replay_matches_plain_replay(league):
+    assert_same_league(recalculate_history(copy.deepcopy(league)), plain_replay(league))
+
+CHANGES = {
+    "edit_middle_day": lambda data: {"kind": "score", "date": middle_day(data)["date"], "player": "Player2", "guesses": 2,
+                                     "solution": middle_day(data)["solution"], "wrong_words_input": "CRANE, SLATE"},
+    "score_today": lambda data: {"kind": "score", "date": "2099-01-01", "player": "Player1", "guesses": "Fail",
+                                 "solution": "CRANE", "wrong_words_input": "SLATE"},
+    "delete_middle_day": lambda data: {"kind": "delete_day", "date": middle_day(data)["date"]},
+    "bulk_backfill": lambda data: {"kind": "bulk", "rows": [
+        {"date": middle_day(data, 30 + i)["date"], "player": p, "solution": "", "guesses": 3, "wrong_words_input": "TRAIN"}
+        for i in range(10) for p in data["players"] if p not in middle_day(data, 30 + i)["scores"]]},
+}
+
+@pytest.mark.parametrize("name", CHANGES)
+def test_incremental_replay_matches_plain_replay(league, name):
+    data = recalculate_history(copy.deepcopy(league))
+    change = CHANGES[name](data)
+    replay_from = apply_change(data, change)
+    recalculate_history(data, replay_from)
+    assert data["replayed_from"] is not None  # resumed from a checkpoint, not a full replay
+    assert_same_league(data, plain_replay(data))
+
+ROSTER_CHANGES = [{"kind": "add_player", "name": "Newcomer"}, {"kind": "delete_player", "name": "Player2"}, {"kind": "recalculate"}]
+
+@pytest.mark.parametrize("make_change", list(CHANGES.values()) + [lambda data, c=c: c for c in ROSTER_CHANGES],
+                         ids=list(CHANGES) + [c["kind"] for c in ROSTER_CHANGES])
+def test_edits_on_a_shallow_copy_leave_the_snapshot_untouched(league, make_change):
+    snapshot = recalculate_history(copy.deepcopy(league)); before = copy.deepcopy(snapshot)
+    data = edit_copy(snapshot)
+    recalculate_history(data, apply_change(data, make_change(data)))
+    assert_same_league(snapshot, before)
+    assert snapshot["checkpoints"] == before["checkpoints"]
+    assert {p: s.to_dict() for p, s in snapshot["states"].items()} == {p: s.to_dict() for p, s in before["states"].items()}
+
+def test_replay_after_roster_change_matches_plain_replay(league):
+    data = recalculate_history(copy.deepcopy(league))
+    apply_change(data, {"kind": "add_player", "name": "Newcomer"})
+    day = middle_day(data)
+    recalculate_history(data, apply_change(data, {"kind": "score", "date": day["date"], "player": "Newcomer", "guesses": 4,
+                                                  "solution": day["solution"], "wrong_words_input": ""}))
+    assert_same_league(data, plain_replay(data))
+
+@pytest.mark.parametrize("changed_outside", [False, True])
+def test_reloaded_league_still_replays_incrementally(league, changed_outside):
+    snapshot = recalculate_history(copy.deepcopy(league))
+    sheets = FakeSheets(snapshot); storage = SheetsStorage(SheetsClient(sheets, per_minute=None))
+    if changed_outside: sheets.grids["history"][5][1] = "CRANE"  # a solution fixed in the sheet
+    data = restore_replay_state(storage.load()[0], previous=snapshot)
+    assert (data["checkpoints"] is snapshot["checkpoints"]) is not changed_outside
+    recalculate_history(data, apply_change(data, CHANGES["edit_middle_day"](data)))
+    assert data["replayed_from"] is not None
+    assert_same_league(data, plain_replay(data))
+
+def test_bulk_import_matches_submitting_each_row(league):
+    rows = CHANGES["bulk_backfill"](league)["rows"]
+    bulk = recalculate_history(copy.deepcopy(league)); recalculate_history(bulk, apply_change(bulk, {"kind": "bulk", "rows": rows}))
+    one_by_one = recalculate_history(copy.deepcopy(league))
+    for row in rows:
+        change = dict(row, kind="score", solution=row["solution"] or next(h["solution"] for h in one_by_one["history"] if h["date"] == row["date"]))
+        recalculate_history(one_by_one, apply_change(one_by_one, change))
+    assert rows and bulk["history"] == one_by_one["history"] and bulk["players"] == one_by_one["players"]
+
+# --- VIEWS ---
+VIEWS = [(build_burn_index, update_burn_index), (build_stats, update_stats), (build_trend, update_trend), (build_windows, update_windows)]
+
+@pytest.mark.parametrize("build, update", VIEWS, ids=[b.__name__ for b, _ in VIEWS])
+@pytest.mark.parametrize("name", CHANGES)
+def test_updated_view_matches_rebuild(league, build, update, name):
+    data = recalculate_history(copy.deepcopy(league)); view = build(data); before = build(data)
+    recalculate_history(data, apply_change(data, CHANGES[name](data)))
+    assert_same_view(update(view, data, data.pop("replayed_from")), build(data))
+    assert_same_view(view, before)  # sessions on the old version may still be reading it
+
+def test_window_totals_match_player_stats(league):
+    data = recalculate_history(copy.deepcopy(league)); stats = build_stats(data)
+    board = window_totals(build_windows(data))
+    for p_name, totals in board.items():
+        expected = player_stats(stats, p_name)
+        assert (totals["games"], totals["h2h"], totals["ties"], totals["avg"]) == (expected["games"], expected["h2h"], expected["ties"], expected["avg"])
+        assert totals["points"] == data["players"][p_name]["score"]
+
+# --- BULK IMPORT ---
+PLAYERS = ["Alice", "Bob"]
+HISTORY = [{"date": "2024-03-02", "solution": "CRANE", "victory_awarded": True, "scores": {"Alice": {"guesses": 3}}}]
+TODAY = date(2024, 3, 10)
+
+def test_import_share_text():
+    text = "Alice\nWordle 986 4/6\n🟩⬛🟨⬛⬛\nSolution: slate\nWords: train, crony\n\nBob: Wordle 986 X/6\n"
+    rows, errors = parse_import(text, PLAYERS, HISTORY, today=TODAY)
+    assert errors == []
+    assert rows == [{"date": "2024-03-01", "player": "Alice", "solution": "SLATE", "guesses": 4, "wrong_words_input": "TRAIN, CRONY"},
+                    {"date": "2024-03-01", "player": "Bob", "solution": "", "guesses": "Fail", "wrong_words_input": ""}]
+
+def test_import_csv_takes_known_solutions_from_history():
+    rows, errors = parse_import("Date,Player,Guesses,Wrong_Words\n2024-03-02,bob,2,SLATE\n", PLAYERS, HISTORY, today=TODAY)
+    assert errors == [] and rows == [{"date": "2024-03-02", "player": "Bob", "solution": "", "guesses": 2, "wrong_words_input": "SLATE"}]
+
+@pytest.mark.parametrize("line, error", [
+    ("2024-03-03,Carol,3,CRANE,", "unknown player 'Carol'"),
+    ("2024-03-11,Bob,3,CRANE,", "2024-03-11 is in the future"),
+    ("03/03/2024,Bob,3,CRANE,", "bad date '03/03/2024'"),
+    ("2024-03-03,Bob,7,CRANE,", "bad guess count '7'"),
+    ("2024-03-03,Bob,3,CRANES,", "not 5-letter words: CRANES"),
+    ("2024-03-02,Alice,4,,", "Alice already has a score for 2024-03-02"),
+    ("2024-03-02,Bob,4,SLATE,", "solution SLATE for 2024-03-02 conflicts with CRANE"),
+    ("2024-03-03,Bob,4,,", "no solution given"),
+])
+def test_import_errors(line, error):
+    rows, errors = parse_import("date,player,guesses,solution,wrong_words\n" + line, PLAYERS, HISTORY, today=TODAY)
+    assert len(errors) == 1 and error in errors[0]
+
+# Spreadsheet exports: a byte-order mark, padded headers, semicolons (European locales).
+@pytest.mark.parametrize("text", [
+    "\ufeffdate,player,guesses,wrong_words\n2024-03-02,bob,2,SLATE\n",
+    "Date , Player ,Guesses, Wrong_Words\n2024-03-02,bob,2,SLATE\n",
+    "date;player;guesses;wrong_words\n2024-03-02;bob;2;SLATE\n",
+])
+def test_import_csv_as_spreadsheets_export_it(text):
+    rows, errors = parse_import(text, PLAYERS, HISTORY, today=TODAY)
+    assert errors == [] and rows == [{"date": "2024-03-02", "player": "Bob", "solution": "", "guesses": 2, "wrong_words_input": "SLATE"}]
+
+@pytest.mark.parametrize("text, error", [
+    ("date,player,solution\n2024-03-02,Bob,CRANE\n", "CSV header needs date, player, guesses columns"),
+    ("Alice scored 4 today\n", "nothing to import"),
+])
+def test_import_reports_text_that_yields_no_rows(text, error):
+    rows, errors = parse_import(text, PLAYERS, HISTORY, today=TODAY)
+    assert rows == [] and len(errors) == 1 and error in errors[0]
+
+def test_import_rejects_duplicate_rows_and_unlisted_words():
+    text = "date,player,guesses,solution,wrong_words\n2024-03-03,Bob,3,CRANE,\n2024-03-03,Bob,4,CRANE,\n2024-03-04,Bob,4,CRANE,XYZZY\n"
+    _, errors = parse_import(text, PLAYERS, HISTORY, today=TODAY, dictionary={"CRANE"})
+    assert errors == ["line 3: Bob already has a row for 2024-03-03", "line 4: not in the word list: XYZZY"]
@@ -0,0 +1,42 @@
+import copy
+
+import pytest
+
+from bench import synthetic_league
+from league import recalculate_history
+from seasons import archive_season, list_seasons, load_season, season_path
+
+@pytest.fixture
+def league():
+    return recalculate_history(synthetic_league(3, 60, seed=5))
+
+def until(data, n):
+    return sorted(h["date"] for h in data["history"])[n - 1]
+
+# A season replays from zero: its file holds the first `n` days scored as if nothing came before.
+def season_replay(data, n):
+    days = [copy.deepcopy(h) for h in data["history"] if h["date"] <= until(data, n)]
+    season = recalculate_history({"players": {p: {} for p in data["players"]}, "history": days})
+    for day in season["history"]: day.setdefault("winner_log", "")
+    return season
+
+def test_archived_season_round_trips(league, tmp_path):
+    path, dates = archive_season("Spring 2024", league, until(league, 30), str(tmp_path))
+    assert path == season_path("Spring 2024", str(tmp_path)) and len(dates) == 30
+    loaded, expected = load_season(path), season_replay(league, 30)
+    assert loaded["players"] == expected["players"]
+    assert loaded["history"] == expected["history"]
+
+def test_list_seasons_reads_the_footers_oldest_first(league, tmp_path):
+    archive_season("Later", {"players": league["players"], "history": [h for h in league["history"] if h["date"] > until(league, 30)]},
+                   until(league, 60), str(tmp_path))
+    archive_season("First", league, until(league, 30), str(tmp_path))
+    first = min(h["date"] for h in league["history"])
+    assert [(s["name"], s["first"], s["last"], s["days"]) for s in list_seasons(str(tmp_path))] == [
+        ("First", first, until(league, 30), 30), ("Later", until(league, 31), until(league, 60), 30)]
+    assert "players" not in list_seasons(str(tmp_path))[0]
+
+def test_archiving_a_season_twice_fails(league, tmp_path):
+    path, _ = archive_season("Spring", league, until(league, 30), str(tmp_path))
+    with pytest.raises(FileExistsError): archive_season("Spring", league, until(league, 40), str(tmp_path))
+    assert len(load_season(path)["history"]) == 30
@@ -0,0 +1,101 @@
+import copy
+import threading
+import time
+
+import pytest
+
+from bench import synthetic_league
+from fake_sheets import FakeSheets, RateLimited
+from league import apply_change, edit_copy, recalculate_history
+from storage import SheetsClient, SheetsStorage, StaleWriteError
+
+def league():
+    return synthetic_league(3, 40, seed=1)
+
+def sheets_storage(sheets, **options):
+    return SheetsStorage(SheetsClient(sheets, **dict({"per_minute": None, "sleep": lambda s: None}, **options)))
+
+def assert_same(loaded, data):
+    assert loaded["players"] == data["players"]
+    assert loaded["history"] == data["history"]
+
+# --- WRITES ---
+def test_full_save_is_one_batch_and_round_trips():
+    data = league(); sheets = FakeSheets(); storage = sheets_storage(sheets)
+    storage.save(data, None)
+    assert sheets.calls == ["batch_update"]
+    loaded, _, warnings = storage.load()
+    assert_same(loaded, data); assert not warnings
+
+def test_delta_save_edits_appends_and_deletes_rows():
+    sheets = FakeSheets(league()); storage = sheets_storage(sheets)
+    data, layout, _ = storage.load(); data = copy.deepcopy(data)
+    data["history"][2]["solution"] = "CRANE"
+    data["history"].insert(0, {"date": "2099-01-01", "solution": "SLATE", "winner_log": "", "victory_awarded": False, "scores": {}})
+    del data["history"][10]
+    sheets.calls.clear()
+    storage.save(data, layout)
+    assert sheets.calls == ["values_batch_get", "batch_update"]
+    assert_same(storage.load()[0], data)
+
+def test_failed_full_save_leaves_both_worksheets_untouched():
+    original = league(); sheets = FakeSheets(original); storage = sheets_storage(sheets)
+    before = copy.deepcopy(sheets.grids)
+    data = copy.deepcopy(original); data["history"][0]["solution"] = "CRANE"
+    sheets.failures = [ValueError("backend error")]
+    with pytest.raises(ValueError): storage.save(data, None)
+    assert sheets.grids == before
+
+def append_day(grids):
+    grids["history"].append(["2099-02-02", "CRANE", "", False, "{}"])
+
+def sort_by_date(grids):
+    header, *rows = grids["history"]; grids["history"] = [header] + sorted(rows, key=lambda r: r[0])
+
+# What the write-behind thread does: on StaleWriteError reload, re-apply the edit, save again.
+@pytest.mark.parametrize("outside_edit", [append_day, sort_by_date])
+def test_rows_changed_outside_the_app_are_merged_not_overwritten(outside_edit):
+    sheets = FakeSheets(recalculate_history(league())); storage = sheets_storage(sheets)
+    data, layout, _ = storage.load()
+    day = data["history"][5]
+    change = {"kind": "score", "date": day["date"], "player": "Player1", "guesses": 1, "solution": day["solution"], "wrong_words_input": ""}
+    edited = edit_copy(data); recalculate_history(edited, apply_change(edited, change))
+    outside_edit(sheets.grids); expected_dates = sorted(row[0] for row in sheets.grids["history"][1:])
+    with pytest.raises(StaleWriteError): storage.save(edited, layout)
+    fresh, layout, _ = storage.load()
+    recalculate_history(fresh, apply_change(fresh, change))
+    storage.save(fresh, layout)
+    loaded = storage.load()[0]
+    assert sorted(h["date"] for h in loaded["history"]) == expected_dates
+    assert next(h for h in loaded["history"] if h["date"] == day["date"])["scores"]["Player1"]["guesses"] == 1
+
+# --- QUOTA ---
+def test_rate_limited_requests_are_retried_with_backoff():
+    sheets = FakeSheets(league()); waits = []
+    storage = sheets_storage(sheets, sleep=waits.append)
+    sheets.failures = [RateLimited(), RateLimited()]
+    storage.load()
+    assert len(waits) == 2 and 0.5 <= waits[0] <= 1 and 1 <= waits[1] <= 2
+
+def test_other_errors_are_not_retried():
+    sheets = FakeSheets(league()); waits = []
+    sheets.failures = [KeyError("players")]
+    with pytest.raises(KeyError): sheets_storage(sheets, sleep=waits.append).load()
+    assert waits == [] and sheets.calls == ["read"]
+
+def test_requests_wait_for_the_per_minute_budget():
+    now = [0.0]; waits = []
+    def sleep(seconds): waits.append(seconds); now[0] += seconds
+    client = SheetsClient(FakeSheets(league()), per_minute=3, clock=lambda: now[0], sleep=sleep)
+    for _ in range(7): client.read("players"); now[0] += 1
+    assert waits == [57.0, 57.0]
+
+def test_concurrent_reads_share_one_request():
+    sheets = FakeSheets(league()); client = SheetsClient(sheets, per_minute=None)
+    sheets.gate = threading.Event(); frames = []
+    threads = [threading.Thread(target=lambda: frames.append(client.read("history"))) for _ in range(8)]
+    for t in threads: t.start()
+    time.sleep(0.2); sheets.gate.set()
+    for t in threads: t.join()
+    assert sheets.calls == ["read"] and len(frames) == 8
+    assert len({id(f) for f in frames}) == 8  # each caller gets its own copy to parse
@@ -0,0 +1,28 @@
+from bench import synthetic_league
+from league import apply_change, recalculate_history
+from simulate import PRESETS, RuleSet, compare_standings, history_features, rules_from_table, rules_table, simulate
+
+def test_current_rules_reproduce_stored_scores():
+    data = synthetic_league(5, 200, seed=7)
+    points = simulate(history_features(data), RuleSet())["points"]
+    assert points.tolist() == [data["players"][p]["score"] for p in data["players"]]
+
+def test_current_rules_follow_an_edit():
+    data = synthetic_league(3, 60, seed=2)
+    day = sorted(data["history"], key=lambda x: x["date"])[20]
+    recalculate_history(data, apply_change(data, {"kind": "score", "date": day["date"], "player": "Player1", "guesses": 1,
+                                                  "solution": day["solution"], "wrong_words_input": ""}))
+    assert simulate(history_features(data), RuleSet())["points"].tolist() == [s["score"] for s in data["players"].values()]
+
+def test_standings_are_ordered_by_the_first_rule_set():
+    data = synthetic_league(4, 90, seed=5)
+    table = compare_standings(history_features(data), PRESETS, workers=1)
+    assert table.index.tolist() == sorted(data["players"], key=lambda p: -data["players"][p]["score"])
+    assert list(table.columns[:2]) == ["Current", "Current rank"]
+
+def test_repeated_rule_set_names_get_their_own_columns():
+    rows = rules_table([PRESETS[0], PRESETS[2]]); rows[1]["Name"] = "Current"
+    rule_sets = rules_from_table(rows + [dict(rows[0])])
+    assert [r.name for r in rule_sets] == ["Current", "Current (2)", "Current (3)"]
+    table = compare_standings(history_features(synthetic_league(3, 30, seed=1)), rule_sets, workers=1)
+    assert table["Current"].tolist() != table["Current (2)"].tolist()
@@ -0,0 +1,72 @@
+import copy
+import time
+
+import pytest
+
+from bench import synthetic_league
+from fake_sheets import FakeSheets
+from league import recalculate_history
+from storage import SheetsClient, SheetsStorage, SQLiteStorage, StaleWriteError, SyncStorage
+
+def league():
+    data = recalculate_history(synthetic_league(3, 40, seed=4))
+    for day in data["history"]: day.setdefault("winner_log", "")  # days nobody played read back with an empty log
+    return data
+
+def sheets_storage(sheets):
+    return SheetsStorage(SheetsClient(sheets, per_minute=None, sleep=lambda s: None))
+
+def assert_same(loaded, data):
+    assert loaded["players"] == data["players"]
+    assert loaded["history"] == data["history"]
+
+# --- SQLITE ---
+def test_sqlite_round_trip(tmp_path):
+    data = league(); storage = SQLiteStorage(str(tmp_path / "league.db"))
+    layout = storage.save(data, None)
+    loaded, loaded_layout, warnings = SQLiteStorage(str(tmp_path / "league.db")).load()
+    assert_same(loaded, data); assert not warnings
+    assert loaded_layout["stamp"] == layout["stamp"]
+
+def test_sqlite_delta_save_edits_adds_and_deletes_days(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "league.db")); storage.save(league(), None)
+    data, layout, _ = storage.load(); data = copy.deepcopy(data)
+    data["history"][2]["solution"] = "CRANE"; data["history"][3]["scores"].popitem()
+    data["history"].insert(0, {"date": "2099-01-01", "solution": "SLATE", "winner_log": "", "victory_awarded": False, "scores": {}})
+    del data["history"][10]
+    storage.save(data, layout)
+    assert_same(storage.load()[0], data)
+
+def test_sqlite_save_from_an_old_stamp_is_stale(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "league.db")); storage.save(league(), None)
+    data, layout, _ = storage.load()
+    storage.save(data, layout)  # someone else writes first
+    data = copy.deepcopy(data); data["history"][0]["solution"] = "CRANE"
+    with pytest.raises(StaleWriteError): storage.save(data, layout)
+    assert storage.load()[0]["history"][0]["solution"] != "CRANE"
+
+# --- SYNC ---
+def wait_for_replica(storage, timeout=5):
+    deadline = time.time() + timeout
+    while storage.replica_status()["backlog"] and time.time() < deadline: time.sleep(0.01)
+    return storage.replica_status()
+
+def test_sync_seeds_an_empty_hot_store_from_sheets(tmp_path):
+    data = league(); sheets = FakeSheets(data)
+    storage = SyncStorage(SQLiteStorage(str(tmp_path / "league.db")), sheets_storage(sheets))
+    loaded, layout, _ = storage.load()
+    assert_same(loaded, data)
+    assert_same(SQLiteStorage(str(tmp_path / "league.db")).load()[0], data)
+    sheets.calls.clear()
+    assert_same(storage.load()[0], data)
+    assert sheets.calls == []  # the hot store answers from now on
+
+def test_sync_replica_catches_up_after_a_failed_write(tmp_path):
+    sheets = FakeSheets(league()); storage = SyncStorage(SQLiteStorage(str(tmp_path / "league.db")), sheets_storage(sheets))
+    storage.RETRY_SECONDS = 0.01
+    data, layout, _ = storage.load(); data = copy.deepcopy(data); data["history"][0]["solution"] = "CRANE"
+    sheets.failures = [ValueError("backend error")]
+    storage.save(data, layout)
+    status = wait_for_replica(storage)
+    assert not sheets.failures and status["backlog"] == 0 and status["error"] is None and status["synced_at"]
+    assert_same(sheets_storage(sheets).load()[0], data)
@@ -0,0 +1,83 @@
+import mmap
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Valid 5-letter Wordle guesses as one sorted array of packed words: 5 bits per letter (A=0),
+# first letter highest, so numeric order is alphabetical order. words.bin is that array as
+# little-endian uint32 (~60 KB). It is memory-mapped on first use and shared by every session:
+# membership is a binary search, prefix completion a range, nothing is parsed at startup.
+# Rebuild from plain word lists with:  python words.py valid.txt answers.txt
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.bin")
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+def pack(word):
+    code = 0
+    for ch in word.upper():
+        i = ord(ch) - 65
+        if not 0 <= i < 26: return None
+        code = code << 5 | i
+    return code if len(word) == 5 else None
+
+def unpack(code):
+    return "".join(ALPHABET[code >> shift & 31] for shift in (20, 15, 10, 5, 0))
+
+class WordIndex:
+    def __init__(self, path=WORDS_FILE):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if sys.byteorder == "little": self.codes = memoryview(self._map).cast("I")
+        else: self.codes = array("I", self._map); self.codes.byteswap()  # rare: one private copy
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, word):
+        code = pack(word)
+        if code is None: return False
+        i = bisect_left(self.codes, code)
+        return i < len(self.codes) and self.codes[i] == code
+
+    def complete(self, prefix, limit=8):
+        prefix = prefix.upper()
+        lo, hi = pack(prefix + "A" * (5 - len(prefix))), pack(prefix + "Z" * (5 - len(prefix)))
+        if lo is None: return []
+        start = bisect_left(self.codes, lo); end = min(bisect_right(self.codes, hi, start), start + limit)
+        return [unpack(self.codes[i]) for i in range(start, end)]
+
+    # Listed words one typo away: a single wrong letter or two neighbours swapped.
+    def suggest(self, word, limit=3):
+        word = word.upper()
+        if len(word) != 5: return []
+        swaps = [word[:i] + word[i + 1] + word[i] + word[i + 2:] for i in range(4)]
+        subs = [word[:i] + ch + word[i + 1:] for i in range(5) for ch in ALPHABET if ch != word[i]]
+        found = []
+        for candidate in swaps + subs:
+            if candidate != word and candidate not in found and candidate in self: found.append(candidate)
+            if len(found) == limit: break
+        return found
+
+_index = None
+_lock = threading.Lock()
+
+def word_index():
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None: _index = WordIndex()
+    return _index
+
+def build(sources, path=WORDS_FILE):
+    words = set()
+    for src in sources:
+        with open(src) as f: words.update(w.strip().upper() for w in f if w.strip())
+    codes = array("I", sorted(c for c in map(pack, words) if c is not None))
+    if sys.byteorder != "little": codes.byteswap()
+    with open(path, "wb") as f: codes.tofile(f)
+    return len(codes)
+
+if __name__ == "__main__":
+    print(f"{build(sys.argv[1:])} words written to {WORDS_FILE}")